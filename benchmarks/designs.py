@@ -0,0 +1,35 @@
+"""
+    Synthetic cable designs for the offline benchmarks, built straight as layout specs so no database
+    is needed.
+"""
+import os
+import sys
+
+ADDON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'cable_2d_cross_section_generator')
+if ADDON_DIR not in sys.path:
+    sys.path.insert(0, ADDON_DIR)  # the engine package has no Odoo dependency
+
+from engine import CableSpec, LayerSpec, solve_layup  # noqa: E402
+
+
+def synthetic_cable(cores=3, shape='circular', armour='Round Wire', conductor_diameter=8.0, insulation=1.0):
+    """
+        Spec of a plausible power/control cable: cores, filler, tape, bedding, armour and outer sheath.
+    """
+    layup = solve_layup(cores)  # the same packing the addon falls back to without a layup table row
+    rings, multiplier = layup.rings, layup.multiplier
+    core_diameter = conductor_diameter + 2 * insulation
+    layup_diameter = multiplier * core_diameter
+    bedding = layup_diameter + 2.4
+    armour_diameter = bedding + 2 * 1.6
+    layers = (
+        LayerSpec('phase_conductor', 'Conductor', conductor_diameter, 0.0, cores, number_of_wires=2),
+        LayerSpec('phase_insulation', 'Insulation', core_diameter, insulation, cores),
+        LayerSpec('filler', 'Filler', layup_diameter, 0.0, 1),
+        LayerSpec('tape', 'Binder Tape', layup_diameter + 0.4, 0.2, 1),
+        LayerSpec('sheath', 'Bedding', bedding, 1.0, 1),
+        LayerSpec('armour', 'Armour', armour_diameter, 1.6, 1, armour_type_shape=armour, armour_tape_width=4.0),
+        LayerSpec('sheath', 'Outer Sheath', armour_diameter + 3.6, 1.8, 1, strip_width=15.0),
+    )
+    return CableSpec(layers, cores, shape, 'Copper', tuple(rings), multiplier)
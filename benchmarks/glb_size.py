@@ -0,0 +1,70 @@
+"""
+    Compare GLB sizes of the reference designs across the 3D export profiles and fail when the compressed
+    profile stops shrinking them.
+
+        python benchmarks/glb_size.py --min-reduction 0.3
+"""
+import argparse
+import io
+import sys
+
+from designs import synthetic_cable
+from engine import build_cable_geometry, solve_layup
+from engine.gltf import export_glb
+from engine.mesh_3d import build_cable_mesh, build_cable_parts
+
+CABLE_LENGTH = 50.0
+LENGTH_STEP = 5.0
+REFERENCE_DESIGNS = [
+    (1, 'circular', 'Round Wire'),
+    (3, 'circular', 'Round Wire'),
+    (3, 'sector', 'Strip / Flat'),
+    (4, 'sector', 'Round Wire'),
+    (5, 'circular', 'Strip / Flat'),
+    (7, 'circular', 'Round Wire'),
+    (19, 'circular', 'Round Wire'),
+    (37, 'circular', 'Strip / Flat'),
+    (61, 'circular', 'Round Wire'),
+]
+
+
+def glb_sizes(cores, shape, armour):
+    geometry = build_cable_geometry(synthetic_cable(cores, shape, armour))
+    strand_layup = solve_layup(7)
+    with io.BytesIO() as buffer:
+        cable_mesh = build_cable_mesh(geometry, CABLE_LENGTH, LENGTH_STEP, strand_layup)
+        cable_mesh.export(buffer, file_type='glb', include_normals=True)
+        merged = len(buffer.getvalue())
+    parts = build_cable_parts(geometry, CABLE_LENGTH, LENGTH_STEP, strand_layup)
+    return {
+        'merged': merged,
+        'nodes': len(export_glb(parts, instancing='nodes')),
+        'gpu': len(export_glb(parts, instancing='gpu')),
+        'gpu+quantized': len(export_glb(parts, instancing='gpu', quantize=True)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--min-reduction', type=float, default=0.3,
+                        help="smallest accepted size reduction of the compressed profile over the merged mesh")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'design':<28}{'merged':>10}{'nodes':>10}{'gpu':>10}{'gpu+quantized':>15}{'reduction':>11}")
+    for cores, shape, armour in REFERENCE_DESIGNS:
+        sizes = glb_sizes(cores, shape, armour)
+        reduction = 1 - sizes['gpu+quantized'] / sizes['merged']
+        name = f"{cores} core {shape} {armour}"
+        print(f"{name:<28}{sizes['merged']:>10}{sizes['nodes']:>10}{sizes['gpu']:>10}{sizes['gpu+quantized']:>15}"
+              f"{reduction:>10.1%}")
+        if reduction < args.min_reduction:
+            failures += 1
+    if failures:
+        print(f"FAIL: {failures} designs shrink less than {args.min_reduction:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
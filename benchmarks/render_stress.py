@@ -0,0 +1,63 @@
+"""
+    Render the same cross-section thousands of times from several threads and check that the resident
+    memory stays flat.
+
+        python benchmarks/render_stress.py --renders 2000 --threads 4
+"""
+import argparse
+import gc
+import resource
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from designs import synthetic_cable
+from engine import build_cable_geometry
+from engine.render_mpl import render_png
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # peak only, outside Linux
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--renders', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=100)
+    parser.add_argument('--max-growth-mb', type=float, default=25.0)
+    args = parser.parse_args()
+
+    geometry = build_cable_geometry(synthetic_cable(3, 'sector'))
+    step = max(args.renders // 10, 1)
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        # warm up on the pool itself: font caches, numpy buffers and the per-thread state of every worker
+        list(executor.map(lambda __: render_png(geometry), range(max(args.warmup, args.threads))))
+        gc.collect()
+        baseline = rss_mb()
+        start = time.perf_counter()
+        samples = []
+        for done in range(0, args.renders, step):
+            sizes = set(executor.map(lambda __: len(render_png(geometry)), range(min(step, args.renders - done))))
+            gc.collect()
+            samples.append(rss_mb())
+            print(f"{done + step:>6} renders  rss {samples[-1]:8.1f} MB  png sizes {sorted(sizes)}")
+    elapsed = time.perf_counter() - start
+    growth = samples[-1] - baseline
+    print(f"{args.renders} renders on {args.threads} threads in {elapsed:.1f}s "
+          f"({args.renders / elapsed:.1f}/s), rss growth {growth:+.1f} MB")
+    if growth > args.max_growth_mb:
+        print(f"FAIL: rss grew more than {args.max_growth_mb} MB")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
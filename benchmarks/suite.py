@@ -0,0 +1,174 @@
+"""
+    Time the 2D and 3D generation of a corpus of synthetic cables and report, per design, the wall time of
+    each step, the peak memory, the matplotlib artist and 3D triangle counts and the PNG and GLB sizes.
+
+    The designs are specs built by ``designs.synthetic_cable``, the snapshot the models take of their order
+    lines, so the suite needs neither Odoo nor a database. Each step times the engine function the model
+    method delegates to: ``_draw_cable_2d`` (layout and PNG), ``_create_rounded_sector`` (sector designs),
+    ``_generate_cable_3d`` (merged mesh) and the instanced GLB export.
+
+    The suite covers the engine only. The model side is not measured: the ORM reads that build the spec
+    (``_get_cable_spec``, the conductor dimension and layup lookups), the render cache, attachments and the
+    3D job queue. Check those on a database, e.g. with Odoo's profiler.
+
+        python benchmarks/suite.py --save baseline.json
+        python benchmarks/suite.py --compare baseline.json --tolerance 0.25
+"""
+import argparse
+import base64
+import json
+import sys
+import time
+import tracemalloc
+
+from designs import synthetic_cable
+from engine import build_cable_geometry, create_rounded_sector, solve_layup
+from engine.gltf import export_glb
+from engine.mesh_3d import build_cable_mesh, build_cable_parts, strand_bundle
+from engine.render_mpl import geometry_artists, render_png
+
+CABLE_LENGTH = 50.0
+LENGTH_STEP = 5.0
+ARMOURS = ('Round Wire', 'Strip / Flat')
+CORPUS = (
+    [(cores, 'circular', armour) for cores in range(1, 6) for armour in ARMOURS]
+    + [(cores, 'sector', armour) for cores in range(2, 6) for armour in ARMOURS]
+    + [(cores, 'circular', armour) for cores in (7, 12, 19, 27, 37, 48, 61) for armour in ARMOURS]
+)
+SECTOR_MAX_CORES = 4  # more cores are laid up as round conductors, whatever the shape
+STEPS = ('layout', 'sectors', '2d', '3d', 'glb')
+SIZES = ('artists', 'triangles', 'png_bytes', 'glb_bytes')
+
+
+def case_name(cores, shape, armour):
+    return f"{cores}c {shape} {'tape' if armour == 'Strip / Flat' else 'wire'}"
+
+
+def rounded_sectors(spec):
+    # the conductor outlines of a sector design, as the layout cuts them for each core
+    conductor, insulation, filler = spec.layers[:3]
+    rounding = conductor.rounding_angle if insulation.thickness > 1 else conductor.rounding_angle * 0.35
+    step = 360 / spec.no_cores
+    return [create_rounded_sector((0, 0), (filler.diameter - 0.2) / 2, 90 + core * step, 90 + (core + 1) * step,
+                                  insulation.thickness, rounding)
+            for core in range(spec.no_cores)]
+
+
+def run_case(cores, shape, armour):
+    """
+        One cold run of every step for a design: caches are emptied first, like for a design never seen.
+
+        :return: (seconds per step, sizes).
+    """
+    build_cable_geometry.cache_clear()
+    strand_bundle.cache_clear()
+    spec = synthetic_cable(cores, shape, armour)
+    strand_layup = solve_layup(7)
+    timings = {}
+
+    start = time.perf_counter()
+    geometry = build_cable_geometry(spec)
+    timings['layout'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if shape == 'sector' and cores <= SECTOR_MAX_CORES:
+        rounded_sectors(spec)
+    timings['sectors'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    png = render_png(geometry)
+    timings['2d'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mesh = build_cable_mesh(geometry, CABLE_LENGTH, LENGTH_STEP, strand_layup)
+    timings['3d'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    glb = export_glb(build_cable_parts(geometry, CABLE_LENGTH, LENGTH_STEP, strand_layup))
+    timings['glb'] = time.perf_counter() - start
+
+    sizes = {
+        'artists': len(geometry_artists(geometry)),
+        'triangles': len(mesh.faces),
+        'png_bytes': len(base64.b64decode(png)),
+        'glb_bytes': len(glb),
+    }
+    return timings, sizes
+
+
+def measure(cores, shape, armour, repeat):
+    """
+        Best wall time of each step over ``repeat`` runs, then one more run traced for the peak memory.
+    """
+    best = dict.fromkeys(STEPS, float('inf'))
+    for __ in range(repeat):
+        timings, sizes = run_case(cores, shape, armour)
+        best = {step: min(best[step], timings[step]) for step in STEPS}
+    tracemalloc.start()
+    run_case(cores, shape, armour)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result = {f'{step}_ms': round(best[step] * 1000, 2) for step in STEPS}
+    result.update(sizes, peak_mb=round(peak / 2 ** 20, 2))
+    return result
+
+
+def regressions(results, baseline, tolerance):
+    """
+        Messages for every design whose total time, peak memory or output size grew more than ``tolerance``
+        over the baseline.
+    """
+    messages = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        total = round(sum(result[f'{step}_ms'] for step in STEPS), 2)
+        reference_total = round(sum(reference[f'{step}_ms'] for step in STEPS), 2)
+        checks = [('total_ms', total, reference_total), ('peak_mb', result['peak_mb'], reference['peak_mb'])]
+        checks += [(size, result[size], reference[size]) for size in SIZES]
+        for metric, value, reference_value in checks:
+            if value > reference_value * (1 + tolerance):
+                messages.append(f"{name}: {metric} {reference_value} -> {value}")
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per design, the best one is kept")
+    parser.add_argument('--filter', default='', help="only the designs whose name contains this text")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--compare', help="JSON file of earlier results to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="growth over the compared results accepted before failing")
+    args = parser.parse_args()
+
+    render_png(build_cable_geometry(synthetic_cable()))  # font caches and imports out of the first design
+    print(f"{'design':<20}" + ''.join(f'{step + " ms":>11}' for step in STEPS)
+          + f"{'peak MB':>9}{'artists':>9}{'triangles':>11}{'png KB':>9}{'glb KB':>9}")
+    results = {}
+    for cores, shape, armour in CORPUS:
+        name = case_name(cores, shape, armour)
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(cores, shape, armour, max(args.repeat, 1))
+        print(f"{name:<20}" + ''.join(f"{result[f'{step}_ms']:>11.1f}" for step in STEPS)
+              + f"{result['peak_mb']:>9.1f}{result['artists']:>9}{result['triangles']:>11}"
+              f"{result['png_bytes'] / 1024:>9.1f}{result['glb_bytes'] / 1024:>9.1f}")
+
+    if args.save:
+        with open(args.save, 'w') as results_file:
+            json.dump(results, results_file, indent=1, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            messages = regressions(results, json.load(baseline_file), args.tolerance)
+        for message in messages:
+            print(f"REGRESSION {message}")
+        if messages:
+            print(f"FAIL: {len(messages)} regressions over {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
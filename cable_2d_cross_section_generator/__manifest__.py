@@ -5,16 +5,26 @@
     "version": "0.1",
     "author": "Hype Studio, Omar Dukmak",
     "category": "Tools",
-    "depends": ["base", "web", "hype_cable_pro", "mrp_overhead_cost", "model_viewer_widget"],
+    "depends": ["base", "web", "bus", "hype_cable_pro", "mrp_overhead_cost", "model_viewer_widget"],
     "data": [
         'security/ir.model.access.csv',
         "data/tds.xml",
+        "data/cable_palette.xml",
+        "data/ir_cron.xml",
         "views/cable_2d_cross_section.xml",
         "views/product_template.xml",
         "views/bom.xml",
         "views/cable_layer_type.xml",
+        "views/cable_palette.xml",
         "views/tds.xml",
+        "views/res_config_settings.xml",
+        "wizard/cable_batch_render_views.xml",
     ],
+    'assets': {
+        'web.assets_backend': [
+            'cable_2d_cross_section_generator/static/src/**/*',
+        ],
+    },
     'demo': [],
     'external_dependencies': {
         'python': ['matplotlib', 'shapely'],
@@ -0,0 +1,119 @@
+import logging
+import re
+import zipfile
+
+from odoo import api, http
+from odoo.exceptions import AccessError
+from odoo.http import content_disposition, request, Stream
+
+_logger = logging.getLogger(__name__)
+
+MODEL_3D_MAX_AGE = 3600  # s, unversioned URLs are revalidated with their ETag after this
+TDS_EXPORT_MODELS = ('sale.order', 'mrp.bom')
+TDS_EXPORT_CHUNK = 20  # records read and written per step of the export, the ORM cache is dropped in between
+
+
+class _ZipStream:
+    # write-only file the ZIP is written to, emptied after every record so only one record is ever held
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def stream_tds_zip(registry, uid, context, model, ids):
+    """
+        Yield a ZIP with one folder per record holding its data sheet page and cross-section image.
+
+        The body of the response is read after the request cursor is closed, so the records are read with a
+        cursor of their own, TDS_EXPORT_CHUNK at a time, and every record's files are compressed and sent
+        before the next one is rendered. A record that fails gets an error.txt instead of stopping the export.
+    """
+    stream = _ZipStream()
+    folders = set()
+    with registry.cursor() as cr:
+        env = api.Environment(cr, uid, context)
+        fmt = env['sale.order']._get_cable_2d_format()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for start in range(0, len(ids), TDS_EXPORT_CHUNK):
+                for record in env[model].browse(ids[start:start + TDS_EXPORT_CHUNK]):
+                    folder = re.sub(r'[^\w.-]+', '_', record.display_name or '').strip('_') or str(record.id)
+                    if folder in folders:
+                        folder = f'{folder}_{record.id}'
+                    folders.add(folder)
+                    try:
+                        with cr.savepoint():
+                            files = record._get_tds_export_files(fmt)
+                    except Exception as e:
+                        _logger.warning(f"TDS export of {model} {record.id} failed: {e}")
+                        files = [('error.txt', str(e).encode())]
+                    for name, content in files:
+                        archive.writestr(f'{folder}/{name}', content, compress_type=(
+                            zipfile.ZIP_STORED if name.endswith('.png') else zipfile.ZIP_DEFLATED))
+                    yield stream.pop()
+                env.invalidate_all()
+    yield stream.pop()  # central directory
+
+
+class Cable3DModelController(http.Controller):
+
+    @http.route('/cable_2d_cross_section_generator/model_3d/<int:order_id>', type='http', auth='user')
+    def model_3d(self, order_id, lod='full', unique=None):
+        """
+            Stream the GLB of a sale order from its attachment, without going through base64 and JSON-RPC.
+            ``lod`` picks the 'full' model or its light 'preview'.
+
+            The response carries the attachment checksum as ETag and honours Range requests, so the viewer
+            can revalidate or resume it; with ``unique`` (the checksum, see ``cable_3d_model_url``) the URL
+            changes with the model and is cached as immutable.
+        """
+        order = request.env['sale.order'].browse(order_id).exists()
+        if not order:
+            raise request.not_found()
+        try:
+            order.check_access_rights('read')
+            order.check_access_rule('read')
+        except AccessError:
+            raise request.not_found()
+        attachment = order.sudo()._get_cable_3d_attachment(lod)
+        if not attachment:
+            raise request.not_found()
+        stream = Stream.from_attachment(attachment)
+        stream.max_age = MODEL_3D_MAX_AGE
+        return stream.get_response(immutable=bool(unique))
+
+    @http.route('/cable_2d_cross_section_generator/tds_export/<int:export_id>', type='http', auth='user')
+    def tds_export(self, export_id):
+        """
+            Download the technical data sheets of many sale orders or BOMs as one ZIP, streamed record by record
+            so memory stays flat whatever the selection size. The selection is read from the cable.tds.export
+            record made by the export action, which only its creator can read.
+        """
+        try:
+            export = request.env['cable.tds.export'].browse(export_id).exists()
+            if not export or export.res_model not in TDS_EXPORT_MODELS:
+                raise request.not_found()
+            records = export._get_records().exists()
+            if not records:
+                raise request.not_found()
+            records.check_access_rights('read')
+            records.check_access_rule('read')
+        except AccessError:
+            raise request.not_found()
+        body = stream_tds_zip(request.env.registry, request.env.uid, dict(request.env.context), records._name,
+                              records.ids)
+        return request.make_response(body, headers=[
+            ('Content-Type', 'application/zip'),
+            ('Content-Disposition', content_disposition('technical_data_sheets.zip')),
+        ])
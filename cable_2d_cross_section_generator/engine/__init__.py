@@ -0,0 +1,14 @@
+"""
+    ORM-free cable layout and rendering engine.
+
+    Models snapshot their order lines into a ``CableSpec``, ``build_cable_geometry`` lays it out once and
+    the 2D and 3D renderers only draw the resulting ``CableGeometry``. Nothing in here touches the
+    database, so it can run in worker threads and benchmarks.
+"""
+from .colors import Palette, darken_hex_color, rgba_array
+from .geometry import (
+    Annulus, CableGeometry, CableSpec, Circle, Label, LayerSpec, Polygon, Wedge, build_cable_geometry,
+)
+from .hashing import spec_digest
+from .layup import Layup, solve_layup
+from .sector import create_rounded_sector
@@ -0,0 +1,39 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .render import render_spec
+
+MAX_WORKERS = 8
+
+
+def default_workers():
+    return max(1, min(MAX_WORKERS, (os.cpu_count() or 2) - 1))
+
+
+def _safe_render(key, spec, fmt='png'):
+    try:
+        return key, render_spec(spec, fmt), None
+    except Exception as e:
+        return key, False, str(e) or e.__class__.__name__
+
+
+def render_specs(specs, max_workers=None, fmt='png'):
+    """
+        Render ``{key: spec}`` to base64 files in ``fmt`` ('png' or 'svg'), spread over a bounded thread pool.
+
+        Yields ``(key, image, error)`` as renders complete; a failing spec only reports its error and the
+        rest of the batch keeps going. Workers never see the ORM, they only get the specs. The renderer keeps
+        no pyplot state so threads can share it; processes are not used, forking an Odoo worker copies the
+        locks held by its other threads and its open database sockets.
+    """
+    jobs = list(specs.items())
+    max_workers = max(1, min(max_workers or default_workers(), MAX_WORKERS, len(jobs) or 1))
+    if max_workers == 1:
+        for key, spec in jobs:
+            yield _safe_render(key, spec, fmt)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_safe_render, key, spec, fmt) for key, spec in jobs]
+        for future in as_completed(futures):
+            yield future.result()
@@ -0,0 +1,100 @@
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_RGBA = (128, 128, 128, 255)
+
+
+@lru_cache(maxsize=1024)
+def hex_to_rgba(hex_color):
+    """
+        RGBA tuple (0-255) of a '#rrggbb' or '#rrggbbaa' color, parsed once per color.
+    """
+    digits = hex_color.lstrip('#')
+    if len(digits) not in (6, 8):
+        raise ValueError(f"'{hex_color}' is not a hex color.")
+    rgba = tuple(int(digits[index:index + 2], 16) for index in range(0, len(digits), 2))
+    return rgba + (255,) * (4 - len(rgba))
+
+
+@lru_cache(maxsize=1024)
+def darken_hex_color(hex_color, percent=25):
+    """
+        Darken colors by percentage, each (color, percent) shade worked out once per process and shared by
+        palette and layer colors alike.
+    """
+    r, g, b, __ = hex_to_rgba(hex_color)
+    factor = 1 - (percent / 100)  # Reduce each component by the given percentage
+    r = max(0, int(r * factor))
+    g = max(0, int(g * factor))
+    b = max(0, int(b * factor))
+
+    # Convert back to hex and return
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+
+def rgba_array(hex_colors, default=DEFAULT_RGBA):
+    """
+        (n, 4) uint8 RGBA array of the colors, each distinct color parsed once; invalid ones get ``default``.
+    """
+    distinct, inverse = np.unique(np.asarray(hex_colors, dtype=object).astype(str), return_inverse=True)
+    table = np.empty((len(distinct), 4), dtype=np.uint8)
+    for row, hex_color in enumerate(distinct):
+        try:
+            table[row] = hex_to_rgba(hex_color)
+        except ValueError:
+            _logger.warning(f"Invalid hex color '{hex_color}'. Using gray.")
+            table[row] = default
+    return table[inverse.reshape(-1)]
+
+
+@dataclass(frozen=True)
+class Palette:
+    """
+        Named cable colors by reference code ('bk', 'gnye'...), each with a primary and a secondary color,
+        the same one for single colors, and the default core colors per number of cores.
+
+        Every color is parsed when the palette is built, so an invalid one fails there, resolving a reference
+        is a dictionary lookup and the 3D mesher's ``rgba_array`` finds the colors already parsed.
+    """
+    entries: tuple  # ((code, primary hex, secondary hex or ''), ...)
+    schemes: tuple = ()  # ((no_cores, (code, ...)), ...) default core colors
+    _pairs: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        pairs = {code.lower(): (primary, secondary or primary) for code, primary, secondary in self.entries}
+        object.__setattr__(self, '_pairs', pairs)
+        for color in {color for pair in pairs.values() for color in pair}:
+            hex_to_rgba(color)  # raises on an invalid color, before anything is drawn with it
+
+    def pair(self, reference):
+        """
+            (first, second) hex colors of a reference: a code, two-colored or not, or 'a/b' for two codes.
+
+            :raise KeyError: when a code is not in the palette.
+        """
+        reference = reference.strip().lower()
+        if '/' in reference:
+            first, second = reference.split('/', 1)
+            return self._pairs[first][0], self._pairs[second][0]
+        return self._pairs[reference]
+
+    def core_colors(self, references):
+        return tuple(self.pair(reference) for reference in references)
+
+    def default_references(self, no_cores):
+        """
+            Default color codes of ``no_cores`` cores: the scheme configured for that count, or the largest
+            scheme repeated over the cores.
+        """
+        schemes = dict(self.schemes)
+        if no_cores in schemes:
+            return tuple(schemes[no_cores])
+        if not schemes or no_cores < 1:
+            return ()
+        largest = schemes[max(schemes)]
+        return tuple(largest[index % len(largest)] for index in range(no_cores))
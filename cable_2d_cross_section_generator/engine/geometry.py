@@ -0,0 +1,404 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
+
+from .sector import sector_outline
+
+DEFAULT_LAYER_COLOR = '#b0b0b0'
+COPPER_COLOR = '#ffa600'
+ALUMINIUM_COLOR = '#b0b0b0'
+FILLER_COLOR = '#e8e8e8'
+TAPE_COLOR = '#bbbbbb'
+SHEATH_COLOR = '#1f1f1f'
+LABEL_CONNECTION = "angle3,angleA=0,angleB=-90"
+
+
+@dataclass(frozen=True)
+class LayerSpec:
+    """
+        Plain snapshot of one cable layer (a sale order line), free of ORM records.
+    """
+    cable_type: str
+    display_name: str = ''
+    diameter: float = 0.0
+    thickness: float = 0.0
+    qty: int = 0
+    color_fill: str = ''
+    number_of_wires: int = 0
+    rounding_angle: float = 1.0
+    rotation: float = 0.0
+    custom_diameter: float = 0.0
+    multiplier_factor: float = 0.0
+    strip_color: str = ''
+    strip_width: float = 0.0
+    strip_width_measure: str = 'degrees'
+    armour_type_shape: str = ''
+    armour_tape_width: float = 0.0
+    conductor_shape: str = ''  # 'sector' or 'circular', conductor layers only
+    conductor_material: str = ''
+
+
+@dataclass(frozen=True)
+class CableSpec:
+    """
+        Everything the layout engine needs to place a cable cross-section.
+    """
+    layers: tuple
+    no_cores: int
+    shape: str  # conductor shape of the first layer, 'sector' or 'circular'
+    conductor_material: str
+    layup_rings: tuple  # cores per layup ring, inner ring first
+    layup_multiplier: float
+    core_colors: tuple = None  # ((hex, hex), ...) per core for BOM designs, None for generic hatching
+
+
+@dataclass(frozen=True)
+class Circle:
+    layer: int
+    role: str
+    center: tuple
+    radius: float
+    colors: tuple = ()
+    hatch: str = ''
+
+
+@dataclass(frozen=True)
+class Wedge:
+    layer: int
+    role: str
+    center: tuple
+    radius: float
+    theta1: float
+    theta2: float
+    colors: tuple = ()
+
+
+@dataclass(frozen=True, eq=False)
+class Polygon:
+    layer: int
+    role: str
+    points: np.ndarray  # read-only (n, 2) outline
+    colors: tuple = ()
+    hatch: str = ''
+
+
+@dataclass(frozen=True)
+class Annulus:
+    layer: int
+    role: str
+    inner_radius: float
+    outer_radius: float
+    colors: tuple = ()
+    linewidth: float = 0.0
+    dash: float = 0.0
+
+
+@dataclass(frozen=True)
+class Label:
+    layer: int
+    text: str
+    xy: tuple
+    xytext: tuple
+    connectionstyle: str = LABEL_CONNECTION
+
+
+@dataclass(frozen=True)
+class CableGeometry:
+    """
+        Immutable layout of a cable cross-section.
+
+        ``elements`` are kept in stacking order from the innermost layer outwards, renderers draw
+        them in reverse so inner layers end up on top of the outer ones.
+    """
+    elements: tuple
+    labels: tuple
+    extent: float  # half of the overall cable diameter
+
+    def by_role(self, *roles):
+        return [element for element in self.elements if element.role in roles]
+
+
+def _material_color(material, color):
+    if material == 'Copper':
+        return COPPER_COLOR
+    if material == 'Aluminium':
+        return ALUMINIUM_COLOR
+    return color
+
+
+def _hatch(layer):
+    return 'O' * max(layer.number_of_wires, 0)  # wires density
+
+
+@lru_cache(maxsize=128)
+def build_cable_geometry(spec):
+    """
+        Lay out the cable described by ``spec``, from inside to outside.
+
+        Results are memoized per spec, so the 2D and 3D renderers of the same design share one layout.
+    """
+    layers = spec.layers
+    if not layers:
+        raise ValueError('No cable layers found to lay out.')
+    elements = []
+    labels = []
+    last_layer = layers[-1]
+    line_height = 0.25 if len(layers) > 9 else 0.3
+    label_x = last_layer.diameter / 2 + last_layer.diameter / 2 * 0.2
+    center_x, center_y = 0, 0
+    center_points = (center_x, center_y)
+    layup_config = spec.layup_rings
+    shape = spec.shape
+    colors = spec.core_colors
+    bom = colors is not None
+    total_cores = spec.no_cores
+    layer_number = 1
+    # annotation anchors carry over between layers, like the insulation label reusing the conductor one
+    arrow_x = arrow_y = outer_radius = 0.0
+
+    def label(index, text, xy, y_pos, connectionstyle=LABEL_CONNECTION):
+        labels.append(Label(index, text, (float(xy[0]), float(xy[1])), (label_x, y_pos), connectionstyle))
+
+    for index, layer in enumerate(layers):
+        layer_color = layer.color_fill or DEFAULT_LAYER_COLOR
+        y_pos = last_layer.diameter / 1.4 - (last_layer.diameter / 2 * line_height * layer_number)
+        diameter = layer.diameter
+        thickness = layer.thickness
+        qty = int(layer.qty)
+        layer_type = layer.cable_type
+        core_colors = colors if bom else repeat(None)
+
+        if layer_type == 'phase_conductor':
+            layer_number += 1
+            if spec.conductor_material and layer_color == DEFAULT_LAYER_COLOR:
+                layer_color = _material_color(spec.conductor_material, layer_color)
+            hatch = _hatch(layer)
+            conductor_radius = diameter / 2
+
+            if qty != total_cores:  # a neutral core sits between the phase cores
+                outer_radius = (layers[index + 4].diameter - layers[index + 1].diameter) / 2
+                angle_step = 100
+                angle_start = 30
+            else:
+                outer_radius = (layers[index + 2].diameter - layers[index + 1].diameter) / 2
+                angle_step = 360 / qty
+                angle_start = 90
+            angles = np.linspace(0, 2 * np.pi, qty, endpoint=False)
+
+            if total_cores <= 4:
+                for angle, color in zip(angles, core_colors):
+                    if shape == 'circular':
+                        center = (center_x + outer_radius * np.cos(angle), center_y + outer_radius * np.sin(angle))
+                        elements.append(Circle(index, 'conductor', center, conductor_radius, (layer_color,), hatch))
+                    elif shape == 'sector':
+                        if qty == total_cores:
+                            sector_radius = (layers[index + 2].diameter - 0.2) / 2  # radius of layer holds the phases
+                        else:
+                            sector_radius = (layers[index + 4].diameter - 0.7) / 2
+                        insulation_thickness = layers[index + 1].thickness
+                        if insulation_thickness > 1:  # fixing rounding ratio for thin conductors
+                            rounding_radius = layer.rounding_angle
+                        else:
+                            rounding_radius = layer.rounding_angle * 0.35
+                        conductor_outline = sector_outline(center_points, sector_radius, angle_start,
+                                                           angle_start + angle_step, insulation_thickness,
+                                                           rounding_radius)
+                        insulation_outline = sector_outline(center_points, sector_radius, angle_start,
+                                                            angle_start + angle_step, -1, rounding_radius)
+                        if conductor_outline is not None:
+                            elements.append(Polygon(index, 'conductor', conductor_outline, (layer_color,), hatch))
+                        if insulation_outline is not None:
+                            elements.append(Polygon(index + 1, 'insulation', insulation_outline,
+                                                    color[:1] if color else ()))
+                        angle_start += angle_step
+            else:
+                core_index = 0
+                insulation = layers[index + 1]
+                for ring, cores_in_ring in enumerate(layup_config):
+                    if ring > 0 and insulation.multiplier_factor > 0:
+                        multiplier_factor = insulation.multiplier_factor
+                    else:
+                        multiplier_factor = spec.layup_multiplier
+                    insulation_diameter = insulation.custom_diameter or insulation.diameter
+                    total_radius = multiplier_factor * (insulation_diameter / 2) - (insulation_diameter / 2)
+                    ring_radius = total_radius - (insulation_diameter * (len(layup_config) - ring - 1))
+                    rotation = np.deg2rad(layer.rotation) if ring == 0 else 0
+                    conductor_diameter = layer.custom_diameter or layer.diameter
+                    for angle in np.linspace(rotation, 2 * np.pi + rotation, cores_in_ring, endpoint=False):
+                        if core_index >= total_cores:
+                            break
+                        center = (center_x + ring_radius * np.cos(angle), center_y + ring_radius * np.sin(angle))
+                        elements.append(Circle(index, 'conductor', center, conductor_diameter / 2,
+                                               (layer_color,), hatch))
+                        core_index += 1
+
+            arrow_x = center_x + (outer_radius / -2) if shape == 'sector' else center_x
+            arrow_y = center_y + outer_radius
+            label(index, layer.display_name, (arrow_x, arrow_y), y_pos)
+
+        elif layer_type == 'phase_insulation':
+            radius = diameter / 2
+            layer_number += 1
+            if total_cores <= 4:
+                outer_radius = (layers[index + 1].diameter - diameter) / 2
+                angles = np.linspace(0, 2 * np.pi, qty, endpoint=False)
+                for angle, color in zip(angles, core_colors):
+                    x = center_x + outer_radius * np.cos(angle)
+                    y = center_y + outer_radius * np.sin(angle)
+                    if shape == 'circular':  # sector insulation is laid out with its conductor
+                        elements.append(Circle(index, 'insulation', (x, y), radius, color or ()))
+                        arrow_x = (diameter - thickness) / 2 if qty > 1 else (
+                                np.cos(np.radians(30)) * (diameter - thickness) / 2)
+                        arrow_y = -y if qty > 1 else (np.sin(np.radians(30)) * (diameter - thickness) / 2)
+            else:
+                core_index = 0
+                insulation_diameter = layer.custom_diameter or layer.diameter
+                insulation_radius = insulation_diameter / 2
+                for ring, cores_in_ring in enumerate(layup_config):
+                    if ring > 0 and layer.multiplier_factor > 0:
+                        multiplier_factor = layer.multiplier_factor
+                    else:
+                        multiplier_factor = spec.layup_multiplier
+                    total_radius = multiplier_factor * insulation_radius - insulation_radius
+                    ring_radius = total_radius - (insulation_diameter * (len(layup_config) - ring - 1))
+                    rotation = np.deg2rad(layers[index - 1].rotation) if ring == 0 else 0
+                    for angle in np.linspace(rotation, 2 * np.pi + rotation, cores_in_ring, endpoint=False):
+                        if core_index >= total_cores:
+                            break
+                        x = center_x + ring_radius * np.cos(angle)
+                        y = center_y + ring_radius * np.sin(angle)
+                        if shape == 'circular':
+                            color = colors[core_index % len(colors)] if bom else ()
+                            elements.append(Circle(index, 'insulation', (x, y), insulation_radius, color))
+                        core_index += 1
+
+            if shape != 'circular':  # annotate for sector cables
+                arrow_y = center_y + thickness
+                if qty in [2, 3, 4]:
+                    arrow_y = center_y + outer_radius / 2
+                if qty == 2:
+                    arrow_y = center_y - outer_radius / 2
+                arrow_x = center_x + thickness / 2
+            label(index, layer.display_name, (arrow_x, arrow_y), y_pos)
+
+        elif layer_type == 'neutral_conductor':
+            layer_number += 1
+            shape = layer.conductor_shape or shape
+            layer_color = _material_color(layer.conductor_material, layer_color)
+            hatch = _hatch(layer)
+            insulation = layers[index + 1]
+            conductor_radius = (diameter - insulation.thickness * 2) / 2
+            insulation_radius = (insulation.diameter - insulation.thickness * 2) / 2
+            outer_radius = layers[4].diameter / 3
+            neutral_color = (colors[-1][0], colors[-1][0]) if bom else ()
+
+            if shape == 'circular':
+                center = (center_x + outer_radius, center_y)
+                elements.append(Circle(index, 'conductor', center, conductor_radius, (layer_color,), hatch))
+                elements.append(Circle(index + 1, 'insulation', center, insulation_radius, neutral_color))
+                label(index, layer.display_name, center, y_pos)
+                # insulation annotation
+                arrow_x = center[0] + (conductor_radius + thickness / 2) * np.cos(np.radians(30))
+                arrow_y = center[1] + (conductor_radius + thickness / 2) * np.sin(np.radians(30))
+            elif shape == 'sector':
+                sector_radius = (layers[index + 2].diameter - 0.7) / 2  # radius of layer holds the neutral layers
+                if insulation.thickness > 1:  # fixing rounding ratio for thin conductors
+                    rounding_radius = layer.rounding_angle
+                else:
+                    rounding_radius = layer.rounding_angle * 0.35
+                thickness = insulation.thickness
+                angle_start, angle_step = -30, 60
+                conductor_outline = sector_outline(center_points, sector_radius, angle_start, angle_start + angle_step,
+                                                   thickness, rounding_radius)
+                insulation_outline = sector_outline(center_points, sector_radius, angle_start,
+                                                    angle_start + angle_step, -1, rounding_radius)
+                if conductor_outline is not None:
+                    elements.append(Polygon(index, 'conductor', conductor_outline, (layer_color,), hatch))
+                if insulation_outline is not None:
+                    elements.append(Polygon(index + 1, 'insulation', insulation_outline, neutral_color[:1]))
+                label(index, layer.display_name, (sector_radius / 2, 0), y_pos)
+                # insulation annotation
+                arrow_x = (sector_radius - 3 * thickness / 4) * np.cos(np.radians(20))
+                arrow_y = (sector_radius - 3 * thickness / 4) * np.sin(np.radians(20))
+            y_pos = last_layer.diameter / 1.4 - (last_layer.diameter / 2 * line_height * layer_number)
+            layer_number += 1
+            label(index + 1, insulation.display_name, (arrow_x, arrow_y), y_pos)
+
+        elif layer_type == 'filler':
+            layer_number += 1
+            layer_color = layer.color_fill or FILLER_COLOR
+            filler_radius = (layer.custom_diameter or diameter) / 2
+            elements.append(Annulus(index, 'filler', 0.0, filler_radius, (layer_color,)))
+            if -y_pos < (last_layer.diameter / 3):
+                connectionstyle = 'angle3,angleA=0,angleB=-90'
+            else:
+                connectionstyle = 'angle,angleA=0,angleB=10,rad=45'
+            label(index, layer.display_name, (0, 0), y_pos, connectionstyle)
+
+        elif layer_type == 'tape':
+            layer_color = layer.color_fill or TAPE_COLOR
+            tape_radius = (layer.custom_diameter or diameter) / 2
+            elements.append(Annulus(index, 'tape', _inner_radius(elements, tape_radius), tape_radius, (layer_color,)))
+
+        elif layer_type == 'sheath':
+            layer_number += 1
+            layer_color = layer.color_fill or SHEATH_COLOR
+            sheath_radius = (layer.custom_diameter or diameter) / 2
+            if layer.strip_width > 0:  # handle strip line for outer layer
+                if layer.strip_width_measure == 'degrees':
+                    strip_width = layer.strip_width
+                else:
+                    strip_width = layer.strip_width * 360 / (2 * np.pi * sheath_radius)
+                elements.append(Wedge(index, 'strip', center_points, sheath_radius, 90 - strip_width / 2,
+                                      90 + strip_width / 2, (layer.strip_color or SHEATH_COLOR,)))
+            elements.append(Annulus(index, 'sheath', _inner_radius(elements, sheath_radius), sheath_radius,
+                                    (layer_color,)))
+            arrow_angle = np.radians(90 - layer_number * 2)
+            arrow_x = center_x + (sheath_radius - thickness / 3) * np.cos(arrow_angle)
+            arrow_y = center_y + (sheath_radius - thickness / 3) * np.sin(arrow_angle)
+            if -y_pos < (last_layer.diameter / 3):
+                angle_b = 60
+            elif last_layer.diameter / 3 < -y_pos < last_layer.diameter / 2:
+                angle_b = 10
+            else:
+                angle_b = -45
+            label(index, layer.display_name, (arrow_x, -arrow_y), y_pos, f"angle,angleA=0,angleB={angle_b},rad=45")
+
+        elif layer_type == 'armour':
+            layer_number += 1
+            prev_diameter = layers[index - 1].diameter
+            layer_color = layer.color_fill or DEFAULT_LAYER_COLOR
+            if layer.custom_diameter > 0:
+                diameter = layer.custom_diameter
+                prev_diameter = layers[index - 1].custom_diameter or prev_diameter
+                thickness = (diameter - prev_diameter) / 2
+            armour_radius = diameter / 2
+            inner_radius = armour_radius - thickness / 2  # armour elements are centered on this radius
+
+            if 'round' in (layer.armour_type_shape or '').lower():
+                wire_radius = thickness / 2
+                num_wires = int(2 * np.pi * inner_radius / (2 * wire_radius)) if wire_radius > 0 else 0
+                for angle in np.linspace(0, 2 * np.pi, num_wires, endpoint=False):
+                    center = (center_x + inner_radius * np.cos(angle), center_y + inner_radius * np.sin(angle))
+                    elements.append(Circle(index, 'armour_wire', center, wire_radius, (layer_color,)))
+            else:
+                elements.append(Annulus(index, 'armour_tape', armour_radius - thickness, armour_radius,
+                                        (layer_color,), linewidth=(diameter - prev_diameter) * 2,
+                                        dash=layer.armour_tape_width))
+            elements.append(Annulus(index, 'armour_band', armour_radius - thickness, armour_radius))
+            connectionstyle = f"angle,angleA=0,angleB={60 if -y_pos < (last_layer.diameter / 3) else 10},rad=45"
+            label(index, layer.display_name, (armour_radius / 5, -(armour_radius - thickness / 2.5)), y_pos,
+                  connectionstyle)
+
+    return CableGeometry(tuple(elements), tuple(labels), last_layer.diameter * 0.5)
+
+
+def _inner_radius(elements, outer_radius):
+    """
+        Inner radius of a concentric layer: the outer radius of the concentric layer below it, if any.
+    """
+    radii = [element.outer_radius for element in elements
+             if isinstance(element, Annulus) and element.outer_radius <= outer_radius]
+    return max(radii, default=0.0)
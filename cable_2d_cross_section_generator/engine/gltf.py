@@ -0,0 +1,221 @@
+import json
+import struct
+
+import numpy as np
+
+GLB_MAGIC = 0x46546C67  # 'glTF'
+JSON_CHUNK = 0x4E4F534A  # 'JSON'
+BIN_CHUNK = 0x004E4942  # 'BIN\0'
+SHORT, FLOAT, UNSIGNED_SHORT, UNSIGNED_INT = 5122, 5126, 5123, 5125
+ARRAY_BUFFER, ELEMENT_ARRAY_BUFFER = 34962, 34963
+INSTANCING_EXTENSION = 'EXT_mesh_gpu_instancing'
+QUANTIZATION_EXTENSION = 'KHR_mesh_quantization'
+QUANTIZATION_STEPS = 2 ** 16 - 1  # positions are stored as unsigned 16-bit grid coordinates
+INSTANCING_MODES = ('gpu', 'nodes')
+
+
+def export_glb(parts, instancing='gpu', quantize=False, layer_names=()):
+    """
+        Write mesh parts as a binary glTF scene, each distinct primitive stored once.
+
+        The scene has one node per cable layer, named after the layer, holding the nodes of its parts, so
+        a viewer can hide or highlight a layer by its node. Every part becomes one mesh; parts of the same
+        color share one PBR material, there are no per-face colors. Its copies are placed either with the
+        ``EXT_mesh_gpu_instancing`` extension (``instancing='gpu'``, one node drawn in a single call, listed as
+        required so viewers without it refuse the file rather than draw a single copy) or with one node per
+        copy all pointing at the same mesh (``instancing='nodes'``, for viewers without the extension).
+
+        With ``quantize``, positions are snapped to a 16-bit grid over the bounding box of their mesh and
+        stored as integers (``KHR_mesh_quantization``), vertices landing on the same grid point are merged,
+        and the grid origin and scale are folded into the transforms of the copies. Smooth vertex normals
+        (``vertex_normals``) are stored as float32 or, quantized, as normalized 16-bit integers, precise
+        enough to survive the uneven scale of the grid.
+
+        :param parts: MeshPart list from ``build_cable_parts``.
+        :param instancing: 'gpu' or 'nodes'.
+        :param quantize: Write quantized positions instead of float32.
+        :param layer_names: Name of each cable layer by index, 'Layer <n>' for the missing ones.
+        :return: GLB file content as bytes.
+    """
+    if instancing not in INSTANCING_MODES:
+        raise ValueError(f"Unknown instancing mode '{instancing}'.")
+    writer = _GlbWriter()
+    materials = {}
+    layers = {}  # layer index: part nodes
+    for part in parts:
+        children = layers.setdefault(part.layer, [])
+        if part.color not in materials:
+            materials[part.color] = writer.material(part.color)
+        material = materials[part.color]
+        if quantize:
+            mesh, origin, scale = writer.quantized_mesh(part.name, part.vertices, part.faces, material)
+        else:
+            mesh, origin, scale = writer.mesh(part.name, part.vertices, part.faces, material), 0.0, None
+        translations = np.asarray(part.translations, dtype=float).reshape(-1, 3) + origin
+        if len(translations) == 1:
+            children.append(writer.node(part.name, mesh=mesh, translation=translations[0], scale=scale))
+            continue
+        if scale is not None:  # the copies snap to the grid too, placed under a node scaled back to mm
+            translations = np.rint(translations / scale)
+        if instancing == 'gpu':
+            accessor = writer.accessor(translations.astype(np.float32), FLOAT, 'VEC3')
+            children.append(writer.node(part.name, mesh=mesh, scale=scale, extensions={INSTANCING_EXTENSION: {
+                'attributes': {'TRANSLATION': accessor},
+            }}))
+            writer.extensions.add(INSTANCING_EXTENSION)
+            writer.required.add(INSTANCING_EXTENSION)  # without it a viewer would draw one copy at the origin
+        else:
+            copies = [writer.node(f'{part.name}.{index}', mesh=mesh, translation=translation)
+                      for index, translation in enumerate(translations)]
+            children.append(writer.node(part.name, scale=scale, children=copies))
+    layer_nodes = [
+        writer.node(layer_names[layer] if layer < len(layer_names) and layer_names[layer] else f'Layer {layer + 1}',
+                    children=children, extras={'layer': layer})
+        for layer, children in layers.items()
+    ]
+    root = writer.node('cable', children=layer_nodes)
+    return writer.glb(root)
+
+
+def quantize_positions(vertices, faces):
+    """
+        Snap vertices to a 16-bit grid over their bounding box and merge the ones that coincide.
+
+        :return: (grid, faces, origin, scale), ``origin + grid * scale`` giving back the positions.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    origin = vertices.min(axis=0)
+    scale = np.maximum(vertices.max(axis=0) - origin, 1e-9) / QUANTIZATION_STEPS
+    grid = np.rint((vertices - origin) / scale).astype(np.uint16)
+    grid, inverse = np.unique(grid, axis=0, return_inverse=True)
+    return grid, inverse.reshape(-1)[faces], origin, scale
+
+
+def vertex_normals(vertices, faces):
+    """
+        Unit normal of each vertex, the sum of the unit normals of its faces weighted by the face angle at
+        the vertex, so how the faces are split into triangles does not tilt it; (0, 0, 1) for a vertex no
+        face uses.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    faces = np.asarray(faces).reshape(-1, 3)
+    corners = vertices[faces]
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    face_normals /= np.maximum(np.linalg.norm(face_normals, axis=1, keepdims=True), 1e-12)
+    normals = np.zeros_like(vertices)
+    for corner in range(3):
+        to_next = corners[:, (corner + 1) % 3] - corners[:, corner]
+        to_previous = corners[:, (corner + 2) % 3] - corners[:, corner]
+        cosine = np.einsum('ij,ij->i', to_next, to_previous) / np.maximum(
+            np.linalg.norm(to_next, axis=1) * np.linalg.norm(to_previous, axis=1), 1e-12)
+        np.add.at(normals, faces[:, corner], face_normals * np.arccos(np.clip(cosine, -1, 1))[:, None])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.where(lengths > 1e-12, normals / np.maximum(lengths, 1e-12), (0.0, 0.0, 1.0))
+
+
+class _GlbWriter:
+    # accumulates the glTF json and its single binary buffer
+
+    def __init__(self):
+        self.gltf = {'asset': {'version': '2.0', 'generator': 'cable_2d_cross_section_generator'},
+                     'buffers': [], 'bufferViews': [], 'accessors': [], 'materials': [], 'meshes': [], 'nodes': []}
+        self.extensions = set()
+        self.required = set()
+        self.chunks = []
+        self.offset = 0
+
+    def accessor(self, array, component_type, kind, target=None, stride=None, normalized=False):
+        array = np.ascontiguousarray(array)
+        view = {'buffer': 0, 'byteOffset': self.offset, 'byteLength': array.nbytes}
+        if target:
+            view['target'] = target
+        if stride:
+            view['byteStride'] = stride
+        self.chunks.append(array.tobytes())
+        self.offset += array.nbytes
+        padding = -self.offset % 4  # accessors must be aligned on their component size
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.offset += padding
+        self.gltf['bufferViews'].append(view)
+        accessor = {'bufferView': len(self.gltf['bufferViews']) - 1, 'componentType': component_type,
+                    'count': len(array), 'type': kind}
+        if normalized:
+            accessor['normalized'] = True
+        if target == ARRAY_BUFFER:  # POSITION needs its bounds, the other attributes may have them
+            accessor.update(min=array.min(axis=0)[:3].tolist(), max=array.max(axis=0)[:3].tolist())
+        self.gltf['accessors'].append(accessor)
+        return len(self.gltf['accessors']) - 1
+
+    def material(self, color):
+        rgba = [channel / 255 for channel in color]
+        material = {'name': '#' + ''.join(f'{channel:02x}' for channel in color),
+                    'pbrMetallicRoughness': {'baseColorFactor': rgba, 'metallicFactor': 0.0, 'roughnessFactor': 0.8},
+                    'doubleSided': False}
+        if rgba[3] < 1:
+            material['alphaMode'] = 'BLEND'
+        self.gltf['materials'].append(material)
+        return len(self.gltf['materials']) - 1
+
+    def mesh(self, name, vertices, faces, material):
+        positions = self.accessor(np.asarray(vertices, dtype=np.float32), FLOAT, 'VEC3', ARRAY_BUFFER)
+        normals = self.accessor(vertex_normals(vertices, faces).astype(np.float32), FLOAT, 'VEC3', ARRAY_BUFFER)
+        return self._primitive(name, positions, normals, faces, material)
+
+    def quantized_mesh(self, name, vertices, faces, material):
+        grid, faces, origin, scale = quantize_positions(vertices, faces)
+        padded = np.zeros((len(grid), 4), dtype=np.uint16)  # vertex attributes are aligned on 4 bytes
+        padded[:, :3] = grid
+        positions = self.accessor(padded, UNSIGNED_SHORT, 'VEC3', ARRAY_BUFFER, stride=padded.itemsize * 4)
+        # normals of the grid mesh: the node scale back to mm turns them into the normals of the real one
+        packed = np.zeros((len(grid), 4), dtype=np.int16)
+        packed[:, :3] = np.rint(vertex_normals(grid, faces) * 32767)
+        normals = self.accessor(packed, SHORT, 'VEC3', ARRAY_BUFFER, stride=packed.itemsize * 4, normalized=True)
+        self.extensions.add(QUANTIZATION_EXTENSION)
+        self.required.add(QUANTIZATION_EXTENSION)
+        return self._primitive(name, positions, normals, faces, material), origin, scale
+
+    def _primitive(self, name, positions, normals, faces, material):
+        vertex_count = self.gltf['accessors'][positions]['count']
+        index_type = (np.uint16, UNSIGNED_SHORT) if vertex_count < 2 ** 16 else (np.uint32, UNSIGNED_INT)
+        indices = self.accessor(np.asarray(faces, dtype=index_type[0]).reshape(-1), index_type[1], 'SCALAR',
+                                ELEMENT_ARRAY_BUFFER)
+        self.gltf['meshes'].append({'name': name, 'primitives': [
+            {'attributes': {'POSITION': positions, 'NORMAL': normals}, 'indices': indices, 'material': material},
+        ]})
+        return len(self.gltf['meshes']) - 1
+
+    def node(self, name, mesh=None, translation=None, scale=None, children=None, extensions=None, extras=None):
+        node = {'name': name}
+        if mesh is not None:
+            node['mesh'] = mesh
+        if translation is not None and np.any(translation):
+            node['translation'] = [round(float(value), 4) if value % 1 else int(value) for value in translation]
+        if scale is not None:
+            node['scale'] = [float(value) for value in scale]
+        if children:
+            node['children'] = children
+        if extensions:
+            node['extensions'] = extensions
+        if extras:
+            node['extras'] = extras
+        self.gltf['nodes'].append(node)
+        return len(self.gltf['nodes']) - 1
+
+    def glb(self, root):
+        self.gltf['scenes'] = [{'nodes': [root]}]
+        self.gltf['scene'] = 0
+        self.gltf['buffers'].append({'byteLength': self.offset})
+        if self.extensions:
+            self.gltf['extensionsUsed'] = sorted(self.extensions)
+        if self.required:
+            self.gltf['extensionsRequired'] = sorted(self.required)
+        content = json.dumps(self.gltf, separators=(',', ':')).encode()
+        content += b' ' * (-len(content) % 4)
+        binary = b''.join(self.chunks)
+        length = 12 + 8 + len(content) + 8 + len(binary)
+        return b''.join([
+            struct.pack('<III', GLB_MAGIC, 2, length),
+            struct.pack('<II', len(content), JSON_CHUNK), content,
+            struct.pack('<II', len(binary), BIN_CHUNK), binary,
+        ])
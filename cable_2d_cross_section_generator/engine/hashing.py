@@ -0,0 +1,27 @@
+import hashlib
+import json
+from dataclasses import asdict, is_dataclass
+
+FLOAT_DIGITS = 6  # ignore float noise below a micrometre when comparing designs
+
+
+def _canonical(value):
+    if is_dataclass(value):
+        return _canonical(asdict(value))
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, float):
+        return round(value, FLOAT_DIGITS) + 0.0  # also folds -0.0 into 0.0
+    return value
+
+
+def spec_digest(spec, *extra):
+    """
+        Canonical sha256 of a render spec plus any extra render settings (output format, renderer version...).
+
+        Two designs with the same layers, cores, layup, colors and product settings get the same digest.
+    """
+    payload = json.dumps([_canonical(spec), _canonical(extra)], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Layup:
+    """
+        Concentric ring structure of laid-up cores: cores per ring (inner ring first) and the lay-up
+        multiplication factor, the laid-up diameter in core diameters.
+    """
+    rings: tuple
+    multiplier: float
+
+    @property
+    def no_cores(self):
+        return sum(self.rings)
+
+    @property
+    def ring_radii(self):
+        """
+            Radius of each ring's core centers, in core diameters: the outer ring touches the lay-up
+            circle and every ring inside sits one core diameter further in.
+        """
+        outer = (self.multiplier - 1) / 2
+        return tuple(outer - (len(self.rings) - ring - 1) for ring in range(len(self.rings)))
+
+
+MAX_CENTER_CORES = 6  # cores of the innermost ring tried by the solver
+
+
+@lru_cache(maxsize=None)
+def solve_layup(no_cores, pitch_ratio=1.0):
+    """
+        Smallest concentric-ring packing of ``no_cores`` equal cores.
+
+        Every ring sits one core diameter outside the previous one, like the lay-up tables. The solver
+        tries each size of center ring (one core, or 2 to 6 cores around the axis), fills the rings
+        outward as full as they get and puts the remaining cores in the last ring, then keeps the packing
+        with the smallest lay-up diameter. The result matches the usual tables (19 cores in 1 + 6 + 12 at
+        5.0, 61 in 1 + 6 + 12 + 18 + 24 at 9.0) and covers any core count they miss.
+
+        :param no_cores: Number of cores to lay up.
+        :param pitch_ratio: Distance between neighbouring cores of a ring, in core diameters (1 when they
+                            touch, more to leave room between them).
+        :return: Layup with the cores per ring and the lay-up multiplication factor.
+    """
+    if no_cores < 1:
+        raise ValueError(f"Cannot lay up {no_cores} cores.")
+    if no_cores == 1:
+        return Layup((1,), 1.0)
+
+    # radius of the center ring for 1..MAX_CENTER_CORES cores, then one core diameter further per ring
+    center_cores = np.arange(1, MAX_CENTER_CORES + 1)
+    center_radius = np.zeros(len(center_cores))
+    center_radius[1:] = pitch_ratio / 2 / np.sin(np.pi / center_cores[1:])
+    ring_count = int(np.ceil(np.sqrt(no_cores))) + 1  # always enough, rings grow by about 6 cores each
+    radii = center_radius[:, None] + np.arange(ring_count)[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        capacity = np.floor(np.pi / np.arcsin(np.minimum(pitch_ratio / 2 / radii, 1)) + 1e-9)
+    capacity[:, 0] = center_cores
+    filled = np.cumsum(capacity, axis=1)
+
+    best = None
+    for row, center in enumerate(center_cores):
+        last = int(np.argmax(filled[row] >= no_cores))  # first ring that holds every core
+        full_rings = [int(cores) for cores in capacity[row, :last]]
+        rings = tuple(full_rings) + (no_cores - sum(full_rings),)
+        if rings[0] != center:
+            continue  # fewer cores than this center ring
+        multiplier = 2 * float(radii[row, last]) + 1
+        candidate = (round(multiplier, 6), center)  # on a tie, the classic 1 + 6 + 12... layup
+        if best is None or candidate < best[0]:
+            best = (candidate, Layup(rings, round(multiplier, 3)))
+    return best[1]
@@ -0,0 +1,346 @@
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from shapely.geometry import Polygon as ShapelyPolygon
+
+from .colors import rgba_array
+from .geometry import Annulus, Circle, Polygon
+from .styles import INSULATION_COLOR
+
+try:
+    import trimesh
+except ImportError:
+    trimesh = None  # Handle case where trimesh is not installed
+
+_logger = logging.getLogger(__name__)
+
+# largest gap between a tessellated circle and the true circle, relative to the cable radius: on screen that is
+# about the same fraction of the model whatever its size
+LOD_CHORD_ERRORS = {
+    'preview': 0.01,
+    'full': 0.001,
+}
+MIN_SECTIONS = 6
+MAX_SECTIONS = 128
+
+
+def arc_sections(radius, chord_error):
+    """
+        Number of sections of a circle of ``radius`` so that no chord is further than ``chord_error`` from it,
+        like the sector outlines, within MIN_SECTIONS and MAX_SECTIONS.
+    """
+    if radius <= chord_error:
+        return MIN_SECTIONS
+    sections = int(np.ceil(np.pi / np.arccos(1 - chord_error / radius)))
+    return min(max(sections, MIN_SECTIONS), MAX_SECTIONS)
+
+
+def cylinder_batch(centers, radii, heights, sections):
+    """
+        Vertices and faces of many capped cylinders along Z, centered on z=0, built in one go.
+
+        Each cylinder has a bottom ring, a top ring and the two cap centers; its faces are two side triangles
+        and one triangle per cap for each section, wound counterclockwise seen from outside. Cylinders may
+        have different section counts, nothing loops over them in Python.
+
+        :param centers: (n, 2) XY centers.
+        :param radii: (n,) radii, or one radius for all.
+        :param heights: (n,) heights, or one height for all.
+        :param sections: (n,) section counts, or one count for all.
+        :return: (vertices, faces, owners), owners giving the cylinder index of each face.
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    count = len(centers)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), (count,))
+    heights = np.broadcast_to(np.asarray(heights, dtype=float), (count,))
+    sections = np.broadcast_to(np.asarray(sections, dtype=np.int64), (count,))
+
+    vertex_counts = 2 * sections + 2
+    first_vertex = np.cumsum(vertex_counts) - vertex_counts
+    owner = np.repeat(np.arange(count), sections)  # cylinder of each ring position
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(sections) - sections, sections)
+    theta = 2 * np.pi * step / sections[owner]
+
+    bottom = first_vertex[owner] + step
+    top = bottom + sections[owner]
+    next_step = np.where(step + 1 == sections[owner], 0, step + 1)
+    bottom_next = first_vertex[owner] + next_step
+    top_next = bottom_next + sections[owner]
+    bottom_center = first_vertex[owner] + 2 * sections[owner]
+    top_center = bottom_center + 1
+
+    vertices = np.empty((int(vertex_counts.sum()), 3))
+    x = centers[owner, 0] + radii[owner] * np.cos(theta)
+    y = centers[owner, 1] + radii[owner] * np.sin(theta)
+    vertices[bottom] = np.column_stack([x, y, -heights[owner] / 2])
+    vertices[top] = np.column_stack([x, y, heights[owner] / 2])
+    cap_centers = first_vertex + 2 * sections
+    vertices[cap_centers] = np.column_stack([centers, -heights / 2])
+    vertices[cap_centers + 1] = np.column_stack([centers, heights / 2])
+
+    faces = np.stack([
+        np.column_stack([bottom, bottom_next, top_next]),
+        np.column_stack([bottom, top_next, top]),
+        np.column_stack([bottom_center, bottom_next, bottom]),
+        np.column_stack([top_center, top, top_next]),
+    ], axis=1).reshape(-1, 3)
+    return vertices, faces, np.repeat(owner, 4)
+
+
+def tube_batch(inner_radii, outer_radii, heights, sections):
+    """
+        Vertices and faces of many hollow tubes around the Z axis, centered on z=0, built in one go.
+
+        Each tube has an outer wall, an inner wall facing the axis and annular end caps, so a concentric
+        layer only covers its own thickness instead of filling everything below it.
+
+        :param inner_radii: (n,) inner radii, or one radius for all.
+        :param outer_radii: (n,) outer radii, or one radius for all.
+        :param heights: (n,) heights, or one height for all.
+        :param sections: (n,) section counts, or one count for all.
+        :return: (vertices, faces, owners), owners giving the tube index of each face.
+    """
+    outer_radii = np.atleast_1d(np.asarray(outer_radii, dtype=float))
+    count = len(outer_radii)
+    inner_radii = np.broadcast_to(np.asarray(inner_radii, dtype=float), (count,))
+    heights = np.broadcast_to(np.asarray(heights, dtype=float), (count,))
+    sections = np.broadcast_to(np.asarray(sections, dtype=np.int64), (count,))
+
+    owner = np.repeat(np.arange(count), sections)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(sections) - sections, sections)
+    theta = 2 * np.pi * step / sections[owner]
+    next_step = np.where(step + 1 == sections[owner], 0, step + 1)
+    first_vertex = np.repeat(4 * (np.cumsum(sections) - sections), sections)
+    # four vertices per section: outer bottom, outer top, inner bottom, inner top
+    outer_bottom, outer_top, inner_bottom, inner_top = (first_vertex + 4 * step + corner for corner in range(4))
+    outer_bottom_next, outer_top_next, inner_bottom_next, inner_top_next = (
+        first_vertex + 4 * next_step + corner for corner in range(4))
+
+    radii = np.column_stack([outer_radii[owner], outer_radii[owner], inner_radii[owner], inner_radii[owner]])
+    z = np.column_stack([-heights[owner], heights[owner], -heights[owner], heights[owner]]) / 2
+    vertices = np.column_stack([
+        (radii * np.cos(theta)[:, None]).reshape(-1),
+        (radii * np.sin(theta)[:, None]).reshape(-1),
+        z.reshape(-1),
+    ])
+    faces = np.stack([
+        np.column_stack([outer_bottom, outer_bottom_next, outer_top_next]),
+        np.column_stack([outer_bottom, outer_top_next, outer_top]),
+        np.column_stack([inner_bottom, inner_top_next, inner_bottom_next]),
+        np.column_stack([inner_bottom, inner_top, inner_top_next]),
+        np.column_stack([outer_bottom, inner_bottom, inner_bottom_next]),
+        np.column_stack([outer_bottom, inner_bottom_next, outer_bottom_next]),
+        np.column_stack([outer_top, inner_top_next, inner_top]),
+        np.column_stack([outer_top, outer_top_next, inner_top_next]),
+    ], axis=1).reshape(-1, 3)
+    return vertices, faces, np.repeat(owner, 8)
+
+
+def _cylinders(centers, radii, heights, sections, colors):
+    # one mesh for a whole batch of cylinders, the face colors follow the owner of each face
+    vertices, faces, owners = cylinder_batch(centers, radii, heights, sections)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, face_colors=np.asarray(colors, dtype=np.uint8)[owners],
+                           process=False)
+
+
+def _tubes(inner_radii, outer_radii, heights, sections, colors):
+    vertices, faces, owners = tube_batch(inner_radii, outer_radii, heights, sections)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, face_colors=np.asarray(colors, dtype=np.uint8)[owners],
+                           process=False)
+
+
+def _extrusion(points, height, color):
+    mesh = trimesh.creation.extrude_polygon(ShapelyPolygon(points), height=height)
+    mesh.apply_translation([0, 0, -height / 2])  # extrusions start at z=0, center them like the cylinders
+    mesh.visual.face_colors = color
+    return mesh
+
+
+def strand_centers(center, radius, strand_layup):
+    """
+        Centers and radius of the strands bundled in a circular conductor of the given radius.
+    """
+    strand_diameter = radius * 2 / 3
+    strand_radius = strand_diameter / 2
+    centers = []
+    for ring_radius, strands_in_ring in zip(strand_layup.ring_radii, strand_layup.rings):
+        for angle in np.linspace(0, 2 * np.pi, strands_in_ring, endpoint=False):
+            centers.append((center[0] + ring_radius * strand_diameter * np.cos(angle),
+                            center[1] + ring_radius * strand_diameter * np.sin(angle)))
+    return centers, strand_radius
+
+
+@lru_cache(maxsize=64)
+def strand_bundle(radius, strand_layup, height, sections):
+    """
+        Mesh of the strands of one circular conductor centered on the origin, shared by every core of the
+        same conductor type within a render and across renders.
+
+        :return: read-only (vertices, faces).
+    """
+    centers, strand_radius = strand_centers((0.0, 0.0), radius, strand_layup)
+    vertices, faces, __ = cylinder_batch(centers, strand_radius, height, sections)
+    vertices.setflags(write=False)
+    faces.setflags(write=False)
+    return vertices, faces
+
+
+def _bundles(rows, strand_layup):
+    # every core a translated copy of its cached bundle, one vectorized copy per conductor type
+    groups = {}
+    for __, center, radius, height, sections, color in rows:
+        groups.setdefault((radius, height, sections), []).append((center, color))
+    meshes = []
+    for (radius, height, sections), cores in groups.items():
+        vertices, faces = strand_bundle(radius, strand_layup, height, sections)
+        centers = np.array([(center[0], center[1], 0.0) for center, __ in cores])
+        offsets = np.arange(len(cores))[:, None, None] * len(vertices)
+        colors = np.repeat(np.array([color for __, color in cores], dtype=np.uint8), len(faces), axis=0)
+        meshes.append(trimesh.Trimesh(vertices=(vertices[None] + centers[:, None]).reshape(-1, 3),
+                                      faces=(faces[None] + offsets).reshape(-1, 3), face_colors=colors,
+                                      process=False))
+    return meshes
+
+
+@dataclass(frozen=True, eq=False)
+class MeshPart:
+    """
+        One distinct primitive of a cable model and the translations of all its copies.
+    """
+    name: str
+    vertices: np.ndarray  # (n, 3)
+    faces: np.ndarray  # (m, 3)
+    color: tuple  # RGBA, 0-255
+    translations: np.ndarray  # (k, 3), one row per copy
+    layer: int = 0  # index of the cable layer it belongs to
+
+    @property
+    def triangle_count(self):
+        return len(self.faces) * len(self.translations)
+
+
+def build_cable_mesh(geometry, cable_length, length_step, strand_layup=None, lod='full'):
+    """
+        Extrude a cable geometry into one trimesh mesh.
+
+        Each layer is ``length_step`` shorter than the one below it so the inner layers stick out.
+
+        :param geometry: CableGeometry from the layout engine.
+        :param cable_length: The length (extrusion height) of the cable segment in mm.
+        :param length_step: How much shorter each outer layer is, in mm.
+        :param strand_layup: Layup used to lay circular conductors as strand bundles.
+        :param lod: Level of detail, a key of LOD_CHORD_ERRORS: circles get as many sections as their radius
+                    needs for that chord error, a thin strand far fewer than the outer sheath.
+        :return: A trimesh.Trimesh object or None if nothing could be meshed.
+    """
+    if not trimesh:
+        _logger.error("Trimesh library not available for 3D generation.")
+        return None
+
+    meshes, cylinders, tubes, bundles = _cable_primitives(geometry, cable_length, length_step, strand_layup, lod)
+    meshes = [mesh for __, mesh, __ in meshes] + _bundles(bundles, strand_layup)
+    if cylinders:
+        meshes.append(_cylinders(*list(zip(*cylinders))[1:]))
+    if tubes:
+        meshes.append(_tubes(*list(zip(*tubes))[1:]))
+
+    if not meshes:
+        _logger.warning("No 3D meshes were generated for the cable.")
+        return None
+
+    _logger.info(f"Concatenating {len(meshes)} 3D meshes ({len(cylinders)} cylinders)...")
+    final_mesh = trimesh.util.concatenate(meshes) if len(meshes) > 1 else meshes[0]
+    _logger.info(f"Final combined mesh has {len(final_mesh.vertices)} vertices and {len(final_mesh.faces)} faces.")
+    return final_mesh
+
+
+def build_cable_parts(geometry, cable_length, length_step, strand_layup=None, lod='full'):
+    """
+        Extrude a cable geometry into its distinct primitives, for exports that instance repeated ones.
+
+        Cylinders of the same size, tessellation and color (armour wires, identical cores) share one mesh
+        centered on the axis and are placed by their translations, so do all the strands of identical
+        conductors; sector extrusions and concentric layers are parts of their own. ``lod`` is the same as for
+        ``build_cable_mesh``.
+
+        :return: list of MeshPart, empty if nothing could be meshed.
+    """
+    if not trimesh:
+        _logger.error("Trimesh library not available for 3D generation.")
+        return []
+
+    meshes, cylinders, tubes, bundles = _cable_primitives(geometry, cable_length, length_step, strand_layup, lod)
+    parts = [MeshPart(f'{element.role}_{element.layer}', np.asarray(mesh.vertices), np.asarray(mesh.faces),
+                      tuple(int(channel) for channel in color), np.zeros((1, 3)), element.layer)
+             for element, mesh, color in meshes]
+    copies = {}
+    for element, center, radius, height, sections, color in cylinders:
+        key = (element.layer, round(radius, 6), round(height, 6), sections, tuple(int(channel) for channel in color))
+        copies.setdefault(key, (element, []))[1].append((center[0], center[1], 0.0))
+    for (layer, radius, height, sections, color), (element, translations) in copies.items():
+        vertices, faces, __ = cylinder_batch([(0.0, 0.0)], radius, height, sections)
+        parts.append(MeshPart(f'{element.role}_{layer}', vertices, faces, color, np.array(translations), layer))
+    cores = {}
+    for element, center, radius, height, sections, color in bundles:
+        key = (element.layer, radius, height, sections, tuple(int(channel) for channel in color))
+        cores.setdefault(key, []).append((center[0], center[1], 0.0))
+    for (layer, radius, height, sections, color), centers in cores.items():
+        # a single strand instanced over every strand of the bundles writes less than a bundle mesh per core
+        offsets, strand_radius = strand_centers((0.0, 0.0), radius, strand_layup)
+        translations = (np.array(centers)[:, None] + np.column_stack([offsets, np.zeros(len(offsets))])[None])
+        vertices, faces, __ = cylinder_batch([(0.0, 0.0)], strand_radius, height, sections)
+        parts.append(MeshPart(f'strands_{layer}', vertices, faces, color, translations.reshape(-1, 3), layer))
+    for element, inner_radius, outer_radius, height, sections, color in tubes:
+        vertices, faces, __ = tube_batch(inner_radius, outer_radius, height, sections)
+        parts.append(MeshPart(f'{element.role}_{element.layer}', vertices, faces,
+                              tuple(int(channel) for channel in color), np.zeros((1, 3)), element.layer))
+    return sorted(parts, key=lambda part: part.layer)
+
+
+def _cable_primitives(geometry, cable_length, length_step, strand_layup, lod):
+    # walk the layout once: meshes built on their own as (element, mesh, color), the cylinders as
+    # (element, center, radius, height, sections, color) rows and the concentric layers as
+    # (element, inner radius, outer radius, height, sections, color) rows and the stranded conductors as
+    # (element, center, radius, height, strand sections, color) rows, for the caller to batch or instance
+    meshes, cylinders, tubes, bundles = [], [], [], []
+    chord_error = LOD_CHORD_ERRORS[lod] * geometry.extent
+    covered_radius = 0.0  # everything inside is filled by a longer concentric layer
+    colors = rgba_array([element.colors[0] if element.colors else INSULATION_COLOR for element in geometry.elements])
+    for element, color in zip(geometry.elements, colors):
+        height = cable_length - length_step * (element.layer + 1)
+        if height <= 0:
+            continue
+        role = element.role
+        try:
+            if isinstance(element, Polygon) and role in ('conductor', 'insulation'):
+                meshes.append((element, _extrusion(element.points, height, color), color))
+            elif isinstance(element, Circle) and element.radius > 1e-6:
+                if role == 'conductor' and strand_layup:
+                    sections = arc_sections(element.radius / 3, chord_error)  # strands are a third of the conductor
+                    bundles.append((element, element.center, round(element.radius, 6), round(height, 6), sections,
+                                    color))
+                elif role in ('conductor', 'insulation', 'armour_wire'):
+                    sections = arc_sections(element.radius, chord_error)
+                    cylinders.append((element, element.center, element.radius, height, sections, color))
+            elif isinstance(element, Annulus) and element.outer_radius > 1e-6:
+                if role in ('filler', 'tape', 'sheath'):
+                    # hollow down to the concentric layer below, which sticks out of it; the layups and armour
+                    # wires in between stay wrapped like in the solid version
+                    inner_radius = covered_radius if covered_radius < element.outer_radius else 0.0
+                    sections = arc_sections(element.outer_radius, chord_error)
+                    if inner_radius > 1e-6:
+                        tubes.append((element, inner_radius, element.outer_radius, height, sections, color))
+                    else:
+                        cylinders.append((element, (0, 0), element.outer_radius, height, sections, color))
+                    covered_radius = element.outer_radius
+                elif role == 'armour_tape' and element.outer_radius > element.inner_radius:
+                    sections = arc_sections(element.outer_radius, chord_error)
+                    tubes.append((element, max(element.inner_radius, 0.0), element.outer_radius, height, sections,
+                                  color))
+                    if element.inner_radius <= covered_radius + 1e-6:
+                        covered_radius = element.outer_radius
+        except Exception as e:
+            _logger.error(f"Error creating 3D {role} for layer {element.layer}: {e}. Skipping.")
+    return meshes, cylinders, tubes, bundles
@@ -0,0 +1,33 @@
+from .geometry import build_cable_geometry
+from .hashing import spec_digest
+
+FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+def render_geometry(geometry, fmt='png'):
+    """
+        Render a cable geometry to a base64 file in the given format ('png' or 'svg').
+    """
+    if fmt == 'svg':
+        from .render_svg import render_svg  # no matplotlib needed
+        return render_svg(geometry)
+    from .render_mpl import render_png
+    return render_png(geometry)
+
+
+def render_spec(spec, fmt='png'):
+    return render_geometry(build_cable_geometry(spec), fmt)
+
+
+def render_key(spec, fmt='png'):
+    """
+        Cache key of a spec rendered in a format, changing with the renderer version.
+    """
+    if fmt == 'svg':
+        from .render_svg import SVG_RENDER_VERSION
+        return spec_digest(spec, 'svg', SVG_RENDER_VERSION)
+    from .render_mpl import RENDER_VERSION
+    return spec_digest(spec, 'png', RENDER_VERSION)
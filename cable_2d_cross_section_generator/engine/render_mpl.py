@@ -0,0 +1,125 @@
+import base64
+import io
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle as MplCircle, Polygon as MplPolygon, Wedge as MplWedge
+
+from .colors import darken_hex_color
+from .styles import geometry_shape_batches
+
+RENDER_VERSION = 3  # bump whenever the drawing changes, it is part of the render cache key
+HATCH_COLORS = hasattr(PatchCollection, 'set_hatchcolor')  # hatches following each path's edge, matplotlib 3.10+
+LABEL_ARROW_COLOR = darken_hex_color('#0000c8', 1)
+
+
+def geometry_artists(geometry):
+    """
+        Matplotlib artists for the geometry, in the order they have to be added to the axes.
+
+        Batches of alike shapes (armour wires, layup cores) become one PatchCollection instead of a patch
+        per shape, which keeps the artist count flat for cables with many wires or cores.
+    """
+    artists = []
+    for batch in geometry_shape_batches(geometry):
+        patches = [_shape_patch(shape) for shape in batch]
+        if len(batch) > 1 and _collectable(batch):
+            first = batch[0]
+            collection = PatchCollection(patches, match_original=True, hatch=first.hatch or None)
+            if first.joinstyle:
+                collection.set_joinstyle(first.joinstyle)
+            if first.hatch:
+                collection.set_hatchcolor('edge')
+            artists.append(collection)
+        else:
+            artists.extend(patches)
+    return artists
+
+
+def draw_geometry(ax, geometry):
+    """
+        Draw a cable geometry on matplotlib axes, annotations included.
+    """
+    for label in geometry.labels:
+        ax.annotate(
+            label.text,
+            size=14,
+            xy=label.xy,
+            xytext=label.xytext,
+            arrowprops=dict(
+                arrowstyle='<-',
+                edgecolor=LABEL_ARROW_COLOR,  # Arrow edge (outline) color
+                connectionstyle=label.connectionstyle,  # Curved arrow path
+                relpos=(0.5, 0.5)
+            ),
+            ha='left',
+            va='center'
+        )
+    for artist in geometry_artists(geometry):
+        if isinstance(artist, PatchCollection):
+            ax.add_collection(artist, autolim=False)
+        else:
+            ax.add_patch(artist)
+
+    dimension = geometry.extent
+    ax.set_xlim(-dimension, dimension * 3)  # increase x for annotations
+    ax.set_ylim(-dimension - 1, dimension + 1)
+
+
+def new_figure(figsize=(6.5, 3.5)):
+    """
+        Figure with its own Agg canvas and one axes, without going through pyplot.
+
+        pyplot keeps every figure in a process-global manager, which is neither thread-safe nor freed
+        unless closed; a figure built this way is private to the caller and garbage collected with it.
+    """
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    ax.set_aspect(1)
+    ax.axis('off')
+    return fig, ax
+
+
+def save_png(fig):
+    """
+        Save a figure to a base64-encoded PNG.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return base64.b64encode(buffer.getvalue())
+
+
+def render_png(geometry):
+    """
+        Render a cable geometry to a base64-encoded PNG. Safe to call from several threads at once.
+    """
+    fig, ax = new_figure()
+    draw_geometry(ax, geometry)
+    return save_png(fig)
+
+
+def _collectable(batch):
+    # a collection has a single hatch and join style, and older matplotlib hatches it in one color
+    first = batch[0]
+    if first.hatch and not HATCH_COLORS:
+        return False
+    return all(shape.hatch == first.hatch and shape.joinstyle == first.joinstyle for shape in batch)
+
+
+def _shape_patch(shape):
+    style = {'fill': shape.fill}
+    for name in ('facecolor', 'edgecolor', 'linewidth', 'joinstyle'):
+        value = getattr(shape, name)
+        if value is not None:
+            style[name] = value
+    if shape.hatch:
+        style['hatch'] = shape.hatch
+    if shape.dashes:
+        style['linestyle'] = shape.dashes
+    if shape.kind == 'wedge':
+        return MplWedge(shape.center, shape.radius, shape.theta1, shape.theta2, **style)
+    if shape.kind == 'polygon':
+        return MplPolygon(shape.points, **style)
+    return MplCircle(shape.center, shape.radius, **style)
@@ -0,0 +1,202 @@
+"""
+    Write cross-sections straight to SVG from the layout geometry, without matplotlib.
+
+    The drawing matches the matplotlib renderer: same shapes, colors and label leaders, with the page sized
+    like the 6.5x3.5in figure so line widths and text keep their proportions. Coordinates are in mm with
+    the y axis flipped, so the result scales without loss in the image widget and in printouts.
+"""
+import base64
+import math
+from xml.sax.saxutils import escape, quoteattr
+
+from .colors import darken_hex_color
+from .styles import geometry_shapes
+
+SVG_RENDER_VERSION = 4  # bump whenever the drawing changes, it is part of the render cache key
+FIGURE_SIZE = (6.5, 3.5)  # inches, same page as the matplotlib figure
+AXES_FRACTION = (0.775, 0.77)  # share of the figure matplotlib gives to the axes
+FONT_SIZE = 14  # pt
+FONT_FAMILY = 'DejaVu Sans, Arial, sans-serif'
+LABEL_ARROW_COLOR = darken_hex_color('#0000c8', 1)
+HATCH_DENSITY = 6  # hatch lines per inch for a single hatch character, as in matplotlib
+HATCH_LINEWIDTH = 1.0  # pt
+TEXT_WIDTH = 0.62  # average glyph width in ems, to size the page around the labels
+PX_PER_PT = 96 / 72  # css pixels, the most widely supported unit for the page size
+
+
+def render_svg(geometry):
+    """
+        Render a cable geometry to a base64-encoded SVG document.
+    """
+    return base64.b64encode(svg_document(geometry).encode())
+
+
+def svg_document(geometry):
+    """
+        The SVG markup of a cable geometry.
+    """
+    dimension = geometry.extent
+    x_min, x_max = -dimension, dimension * 3  # room on the right for the labels
+    y_min, y_max = -dimension - 1, dimension + 1
+    width, height = x_max - x_min, y_max - y_min
+    scale = 72 * min(FIGURE_SIZE[0] * AXES_FRACTION[0] / width, FIGURE_SIZE[1] * AXES_FRACTION[1] / height)
+    writer = _SvgWriter(1 / scale)  # points to mm
+    for label in geometry.labels:  # labels may stick out of the axes, matplotlib does not clip them either
+        x, y = label.xytext
+        half_height = FONT_SIZE / scale
+        x_max = max(x_max, x + len(label.text) * FONT_SIZE * TEXT_WIDTH / scale)
+        y_min, y_max = min(y_min, y - half_height), max(y_max, y + half_height)
+    width, height = x_max - x_min, y_max - y_min
+
+    body = [writer.shape(shape) for shape in geometry_shapes(geometry)]
+    body.extend(writer.label(label) for label in geometry.labels)
+    view_box = f'{_num(x_min)} {_num(-y_max)} {_num(width)} {_num(height)}'
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_num(width * scale * PX_PER_PT)}" '
+        f'height="{_num(height * scale * PX_PER_PT)}" viewBox="{view_box}">\n'
+        f'<defs>\n{"".join(writer.defs)}</defs>\n'
+        f'{"".join(body)}'
+        f'</svg>\n'
+    )
+
+
+def _num(value):
+    return f'{value:.3f}'.rstrip('0').rstrip('.') if value else '0'
+
+
+def _point(x, y):
+    return f'{_num(x)},{_num(-y)}'  # svg y axis points down
+
+
+class _SvgWriter:
+
+    def __init__(self, pt):
+        self.pt = pt  # size of a point in drawing units
+        self.defs = []
+        self.patterns = {}
+
+    def shape(self, shape):
+        if shape.kind == 'wedge':
+            tag, geometry = self._wedge(shape)
+        elif shape.kind == 'polygon':
+            tag, geometry = 'polygon', f'points="{" ".join(_point(x, y) for x, y in shape.points)}"'
+        else:
+            tag, geometry = 'circle', self._circle(shape.center, shape.radius)
+
+        facecolor = shape.facecolor if shape.fill and shape.facecolor else 'none'
+        edgecolor = shape.edgecolor or ('none' if shape.fill else 'black')
+        linewidth = self.pt * (1.0 if shape.linewidth is None else shape.linewidth)
+        stroke = f'stroke={quoteattr(edgecolor)}'
+        if edgecolor != 'none':
+            stroke += f' stroke-width="{_num(linewidth)}"'
+            if shape.joinstyle:
+                stroke += f' stroke-linejoin="{shape.joinstyle}"'
+            if shape.dashes:
+                offset, (on, off) = shape.dashes  # matplotlib scales dashes with the line width
+                stroke += (f' stroke-dasharray="{_num(on * linewidth)} {_num(off * linewidth)}"'
+                           f' stroke-dashoffset="{_num(offset * linewidth)}"')
+        hatch = shape.hatch and self._pattern(shape.hatch, shape.edgecolor or 'black')
+        if not hatch:
+            return f'<{tag} {geometry} fill={quoteattr(facecolor)} {stroke}/>\n'
+        # face, then hatch, then edge like matplotlib; the hatch takes the edge color
+        return (f'<{tag} {geometry} fill={quoteattr(facecolor)} stroke="none"/>\n'
+                f'<{tag} {geometry} fill="url(#{hatch})" {stroke}/>\n')
+
+    def _circle(self, center, radius):
+        return f'cx="{_num(center[0])}" cy="{_num(-center[1])}" r="{_num(radius)}"'
+
+    def _wedge(self, shape):
+        theta1, theta2 = shape.theta1, shape.theta2
+        if theta2 <= theta1:
+            theta2 += 360  # matplotlib always goes counterclockwise from theta1
+        if theta2 - theta1 >= 360:
+            return 'circle', self._circle(shape.center, shape.radius)
+        (cx, cy), radius = shape.center, shape.radius
+        start, end = ((cx + radius * math.cos(math.radians(theta)), cy + radius * math.sin(math.radians(theta)))
+                      for theta in (theta1, theta2))
+        large_arc = 1 if theta2 - theta1 > 180 else 0
+        return 'path', (f'd="M{_point(cx, cy)} L{_point(*start)} '
+                        f'A{_num(radius)},{_num(radius)} 0 {large_arc} 0 {_point(*end)} Z"')
+
+    def _pattern(self, hatch, color):
+        """
+            Id of the ``<pattern>`` def drawing a matplotlib hatch ('x' lines or 'O' circles) in the color, or
+            None for a hatch with neither, drawn as a plain fill.
+        """
+        key = (hatch, color)
+        if key in self.patterns:
+            return self.patterns[key]
+        lines = sum(hatch.count(char) for char in 'xX/\\')
+        circles = hatch.count('O')
+        if not lines and not circles:
+            self.patterns[key] = None
+            return None
+        pattern_id = f'hatch{len(self.defs)}'
+        self.patterns[key] = pattern_id
+        inch = 72 * self.pt
+        stroke = f'stroke={quoteattr(color)} stroke-width="{_num(HATCH_LINEWIDTH * self.pt)}" fill="none"'
+        marks = []
+        if lines:
+            side = inch / (HATCH_DENSITY * lines)
+            tile = (side, side)
+            marks.append(f'<path d="M0,0 L{_num(side)},{_num(side)} M0,{_num(side)} L{_num(side)},0" {stroke}/>')
+        if circles:
+            side = inch / (HATCH_DENSITY * circles)
+            radius = 0.35 * side  # matplotlib's large circles
+            tile = (side, 2 * side)  # odd rows are shifted by half a column
+            centers = [(0, 0), (side, 0), (side / 2, side), (0, 2 * side), (side, 2 * side)]
+            marks.extend(f'<circle cx="{_num(x)}" cy="{_num(y)}" r="{_num(radius)}" {stroke}/>' for x, y in centers)
+        self.defs.append(
+            f'<pattern id="{pattern_id}" patternUnits="userSpaceOnUse" width="{_num(tile[0])}" '
+            f'height="{_num(tile[1])}">{"".join(marks)}</pattern>\n')
+        return pattern_id
+
+    def label(self, label):
+        """
+            Label text with its leader line, the arrow head pointing at the text like '<-' in matplotlib.
+        """
+        text_x, text_y = label.xytext
+        start = (text_x - 2 * self.pt, text_y)  # matplotlib shrinks the leader 2pt away from the text
+        end = label.xy
+        style = dict(item.split('=') for item in label.connectionstyle.split(',')[1:])
+        corner = _intersection(start, float(style.get('angleA', 0)), end, float(style.get('angleB', 90)))
+        if corner is None:
+            path = f'M{_point(*start)} L{_point(*end)}'
+            toward = end
+        elif label.connectionstyle.startswith('angle3'):
+            path = f'M{_point(*start)} Q{_point(*corner)} {_point(*end)}'
+            toward = corner
+        else:
+            path = f'M{_point(*start)} L{_point(*corner)} L{_point(*end)}'
+            toward = corner
+
+        head = self._arrow_head(start, toward)
+        return (
+            f'<path d="{path}" fill="none" stroke="{LABEL_ARROW_COLOR}" stroke-width="{_num(self.pt)}"/>\n'
+            f'<path d="{head}" fill="none" stroke="{LABEL_ARROW_COLOR}" stroke-width="{_num(self.pt)}"/>\n'
+            f'<text x="{_num(text_x)}" y="{_num(-text_y)}" font-size="{_num(FONT_SIZE * self.pt)}" '
+            f'font-family={quoteattr(FONT_FAMILY)} dominant-baseline="central">{escape(label.text)}</text>\n'
+        )
+
+    def _arrow_head(self, tip, toward):
+        length = math.hypot(toward[0] - tip[0], toward[1] - tip[1])
+        if not length:
+            return ''
+        ux, uy = (toward[0] - tip[0]) / length, (toward[1] - tip[1]) / length
+        head_length, head_width = 0.4 * FONT_SIZE * self.pt, 0.2 * FONT_SIZE * self.pt  # arrow style '<-'
+        base = (tip[0] + ux * head_length, tip[1] + uy * head_length)
+        left = (base[0] - uy * head_width, base[1] + ux * head_width)
+        right = (base[0] + uy * head_width, base[1] - ux * head_width)
+        return f'M{_point(*left)} L{_point(*tip)} L{_point(*right)}'
+
+
+def _intersection(point_a, angle_a, point_b, angle_b):
+    # corner of the 'angle' and 'angle3' connections: lines leaving A and B at their angles
+    cos_a, sin_a = math.cos(math.radians(angle_a)), math.sin(math.radians(angle_a))
+    cos_b, sin_b = math.cos(math.radians(angle_b)), math.sin(math.radians(angle_b))
+    determinant = cos_a * sin_b - sin_a * cos_b
+    if abs(determinant) < 1e-9:
+        return None
+    dx, dy = point_b[0] - point_a[0], point_b[1] - point_a[1]
+    t = (dx * sin_b - dy * cos_b) / determinant
+    return point_a[0] + t * cos_a, point_a[1] + t * sin_a
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+from shapely.geometry import Polygon
+
+CHORD_TOLERANCE = 0.01  # mm, largest gap allowed between a tessellated arc and the true arc
+
+
+def create_rounded_sector(center, radius, start_angle, end_angle, thickness, round_radius):
+    """
+        Create a rounded sector as a shapely polygon (empty when the rounding eats the whole sector).
+    """
+    points = rounded_sector_points(center, radius, start_angle, end_angle, thickness, round_radius)
+    return Polygon(points) if points is not None else Polygon()
+
+
+def sector_outline(center, radius, start_angle, end_angle, thickness, round_radius, tolerance=CHORD_TOLERANCE):
+    """
+        Rounded sector outline as a read-only (n, 2) array of points.
+    """
+    return rounded_sector_points(center, radius, start_angle, end_angle, thickness, round_radius, tolerance)
+
+
+def rounded_sector_points(center, radius, start_angle, end_angle, thickness, round_radius, tolerance=CHORD_TOLERANCE):
+    """
+        Closed outline of a sector shrunk and rounded like a conductor (or its insulation with thickness -1).
+
+        The shape is the sector eroded by ``round_radius + thickness`` then grown back by ``round_radius``,
+        which rounds its three corners. For the sectors of a cable (up to a half disk) that is computed in
+        closed form: the straight edges are offset inward, the outer arc shrinks and each corner becomes a
+        fillet arc tangent to both, tessellated so no chord is further than ``tolerance`` from the true arc.
+
+        :return: read-only (n, 2) array with the first point repeated at the end, or None if nothing is left.
+    """
+    if thickness == -1:  # Round the edges of the sector for insulation
+        round_radius = round_radius or 1
+        erosion = fillet = round_radius + 1
+    else:  # Round the edges of the sector for conductor
+        erosion, fillet = round_radius + thickness, round_radius
+    span = end_angle - start_angle
+    if not 0 < span <= 180 or erosion < 0 or fillet < 0:
+        points = _buffered_sector_points(center, radius, start_angle, end_angle, erosion, fillet)
+    else:
+        points = _analytic_sector_points(center, radius, start_angle, end_angle, erosion, fillet, tolerance)
+    if points is not None:
+        points.setflags(write=False)
+    return points
+
+
+def _analytic_sector_points(center, radius, start_angle, end_angle, erosion, fillet, tolerance):
+    start, end = math.radians(start_angle), math.radians(end_angle)
+    half_span = (end - start) / 2
+    inner_radius = radius - erosion  # outer arc of the eroded sector
+
+    # the eroded sector: apex on the bisector, the offset edges meet the shrunk arc at two corners
+    is_half_disk = math.isclose(half_span, math.pi / 2)
+    apex_distance = erosion if is_half_disk else erosion / math.sin(half_span)
+    if inner_radius <= apex_distance:
+        return None
+    corner_offset = math.atan2(erosion, math.sqrt(inner_radius ** 2 - erosion ** 2))  # angle of the corners
+    corner_start, corner_end = start + corner_offset, end - corner_offset
+
+    # grown back: fillets around the corners, joined by the offset edges and the outer arc
+    normal_start, normal_end = start - math.pi / 2, end + math.pi / 2  # outward normals of the straight edges
+    arcs = [  # (center distance, center angle, radius, from, to), all counterclockwise
+        (inner_radius, corner_start, fillet, normal_start, corner_start),
+        (0.0, 0.0, inner_radius + fillet, corner_start, corner_end),
+        (inner_radius, corner_end, fillet, corner_end, normal_end),
+    ]
+    if not is_half_disk:
+        arcs.append((apex_distance, start + half_span, fillet, normal_end, normal_start + 2 * math.pi))
+    distances, directions, radii, theta1, theta2 = np.array(arcs).T
+    sweeps = theta2 - theta1
+    steps = np.where(radii > tolerance, 2 * np.arccos(1 - tolerance / np.maximum(radii, tolerance)), sweeps)
+    counts = np.maximum(np.ceil(sweeps / np.maximum(steps, 1e-12)), 1).astype(int)
+
+    # tessellate every arc at once, count + 1 points each, straight edges are implied between arcs
+    arc_index = np.repeat(np.arange(len(arcs)), counts + 1)
+    first_point = np.repeat(np.cumsum(counts + 1) - (counts + 1), counts + 1)
+    thetas = theta1[arc_index] + sweeps[arc_index] * (np.arange(len(arc_index)) - first_point) / counts[arc_index]
+    x = center[0] + distances[arc_index] * np.cos(directions[arc_index]) + radii[arc_index] * np.cos(thetas)
+    y = center[1] + distances[arc_index] * np.sin(directions[arc_index]) + radii[arc_index] * np.sin(thetas)
+    points = np.column_stack([x, y])
+    keep = np.ones(len(points), dtype=bool)
+    keep[1:] = np.hypot(*np.diff(points, axis=0).T) > 1e-9  # fillets end where the outer arc starts
+    points = points[keep]
+    return np.vstack([points, points[:1]])
+
+
+def _buffered_sector_points(center, radius, start_angle, end_angle, erosion, fillet):
+    # concave sectors (over a half disk) are not rounded the same way, keep shapely's morphology for them
+    angles = np.deg2rad(np.linspace(start_angle, end_angle, 100))
+    points = np.column_stack([center[0] + radius * np.cos(angles), center[1] + radius * np.sin(angles)])
+    sector_polygon = Polygon(np.vstack([center, points, center]))
+    rounded_sector = sector_polygon.buffer(-erosion).buffer(fillet, join_style="round")
+    if rounded_sector.is_empty or rounded_sector.geom_type != 'Polygon':
+        return None
+    return np.column_stack(rounded_sector.exterior.xy)
@@ -0,0 +1,129 @@
+from dataclasses import dataclass
+
+from .colors import darken_hex_color
+from .geometry import Annulus, Circle, Polygon, Wedge
+
+EDGE_COLOR = '#303030'
+INSULATION_COLOR = '#a3a3a3'
+
+
+@dataclass(frozen=True, eq=False)
+class Shape:
+    """
+        One styled primitive of the drawing, independent of the output format.
+
+        ``kind`` is 'circle', 'wedge' or 'polygon'. Colors left to None keep the renderer default, like an
+        unset matplotlib patch property; ``dashes`` is a matplotlib ``(offset, (on, off))`` pattern in
+        line widths.
+    """
+    kind: str
+    center: tuple = (0.0, 0.0)
+    radius: float = 0.0
+    theta1: float = 0.0
+    theta2: float = 360.0
+    points: object = None
+    facecolor: str = None
+    edgecolor: str = None
+    fill: bool = True
+    hatch: str = ''
+    linewidth: float = None
+    dashes: tuple = None
+    joinstyle: str = None
+
+
+def geometry_shapes(geometry):
+    """
+        Styled shapes of the geometry, in the order they have to be painted.
+    """
+    return [shape for batch in geometry_shape_batches(geometry) for shape in batch]
+
+
+def geometry_shape_batches(geometry):
+    """
+        Styled shapes of the geometry in paint order, grouped in batches that can be drawn in one go.
+
+        Consecutive elements of the same layer and role (the cores of a layup, the wires of an armour) do
+        not overlap, so the n-th shape of each of them goes in one batch: three batches for all the armour
+        wires rather than three shapes per wire.
+    """
+    batches = []
+    run, run_key = [], None
+    for element in reversed(geometry.elements):  # prioritize inner layers over outer layers
+        shapes = element_shapes(element)[::-1]
+        key = (element.layer, element.role, type(element), len(shapes))
+        if key != run_key:
+            batches.extend(list(batch) for batch in zip(*run))
+            run, run_key = [], key
+        run.append(shapes)
+    batches.extend(list(batch) for batch in zip(*run))
+    return batches
+
+
+def element_shapes(element):
+    role = element.role
+    color = element.colors[0] if element.colors else None
+    if isinstance(element, Circle):
+        center, radius = element.center, element.radius
+        if role == 'conductor':
+            darken = 30 if element.hatch else 0
+            return [
+                Shape('wedge', center, radius, edgecolor=EDGE_COLOR, fill=False),
+                Shape('wedge', center, radius, hatch=element.hatch, edgecolor=color,
+                      facecolor=darken_hex_color(color, darken)),
+            ]
+        if role == 'insulation':
+            if element.colors:  # half circles for dual color insulation
+                return [
+                    Shape('wedge', center, radius, 90, 270, facecolor=element.colors[0], edgecolor=element.colors[0]),
+                    Shape('wedge', center, radius, 270, 90, facecolor=element.colors[-1],
+                          edgecolor=element.colors[-1]),
+                ]
+            return [Shape('wedge', center, radius, facecolor=INSULATION_COLOR, edgecolor=EDGE_COLOR, hatch='xxx')]
+        if role == 'armour_wire':
+            return [
+                _solid('circle', center, radius, darken_hex_color(color, 75), fill=False),
+                _solid('circle', center, radius * 0.5, color),
+                _solid('circle', center, radius, darken_hex_color(color, 40)),
+            ]
+    elif isinstance(element, Polygon):
+        points = element.points
+        if role == 'conductor':
+            darken = 30 if element.hatch else 0
+            return [
+                Shape('polygon', points=points, edgecolor=EDGE_COLOR, joinstyle='round', fill=False),
+                Shape('polygon', points=points, facecolor=darken_hex_color(color, darken), hatch=element.hatch,
+                      edgecolor=color, joinstyle='round'),
+            ]
+        if role == 'insulation':
+            if color:
+                return [Shape('polygon', points=points, facecolor=color, joinstyle='round')]
+            return [Shape('polygon', points=points, facecolor=INSULATION_COLOR, edgecolor=EDGE_COLOR, hatch='xxx',
+                          joinstyle='round')]
+    elif isinstance(element, Annulus):
+        center, radius = (0, 0), element.outer_radius
+        if role == 'filler':
+            return [Shape('circle', center, radius, facecolor=color, edgecolor=darken_hex_color(color, 30))]
+        if role == 'tape':
+            return [Shape('circle', center, radius, facecolor='#ffffff', edgecolor=color, linewidth=1.5)]
+        if role == 'sheath':
+            return [
+                _solid('circle', center, radius, darken_hex_color(color, 30), fill=False, linewidth=0.5),
+                _solid('circle', center, radius, color),
+            ]
+        if role == 'armour_tape':
+            mid_radius = (element.inner_radius + element.outer_radius) / 2
+            return [_solid('circle', center, mid_radius + 0.1, color, fill=False, linewidth=element.linewidth,
+                           dashes=(5, (element.dash, 1)))]
+        if role == 'armour_band':
+            return [
+                _solid('circle', center, element.inner_radius, 'black', fill=False),
+                _solid('circle', center, element.outer_radius, 'white'),
+            ]
+    elif isinstance(element, Wedge):
+        return [_solid('wedge', element.center, element.radius, color, theta1=element.theta1, theta2=element.theta2)]
+    return []
+
+
+def _solid(kind, center, radius, color, **style):
+    # a single color for face and edge, what matplotlib's ``color=`` does
+    return Shape(kind, center, radius, facecolor=color, edgecolor=color, **style)
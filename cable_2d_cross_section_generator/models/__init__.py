@@ -4,5 +4,10 @@ from . import bom_inherit
 from . import cable_layer_type
 from . import tds
 from . import sale_order_line
+from . import conductor_dimensions
 from . import layup_diameter_multiplication_factor_inherit
+from . import cable_3d_job
 from . import cable_3d_modeling
+from . import cable_render_cache
+from . import res_config_settings
+from . import cable_palette
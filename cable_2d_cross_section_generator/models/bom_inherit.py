@@ -1,32 +1,49 @@
-from odoo import models, fields, api
+from odoo import models, fields
 from odoo.exceptions import ValidationError
 
+from .cable_2d_cross_section import write_cable_2d_image
+from .tds import tds_export_action, tds_export_files
+
 
 class BOM(models.Model):
     _inherit = 'mrp.bom'
 
     cable_2d_image = fields.Binary("Cable 2D Cross-Section Image")
-    tds_html = fields.Html(string="TDS Details", compute="_compute_tds_html", sanitize=False)
-
-    @api.depends('design_id')
-    def _compute_tds_html(self):
-        for rec in self:
-            rec.tds_html = self.env['ir.qweb']._render('cable_2d_cross_section_generator.tds_html_template', {
-                'order': rec.design_id
-            })
+    tds_html = fields.Html(string="TDS Details", related='design_id.tds_html')  # stored on the design, not rendered
 
     def generate_cable_cross_section_image(self):
         """
             Generate 2D and 3D designs for the cable based on product attributes.
         """
         try:
+            fmt = self.env['sale.order']._get_cable_2d_format()
             for rec in self:
                 layers = rec.design_id.order_line  # get cable layers
-                cable_2d_img = rec.design_id._draw_cable_2d(layers, rec)  # Generate 2D cross-section
-                rec.cable_2d_image = cable_2d_img  # store the figure as an image field
+                cable_2d_img = rec.design_id._draw_cable_2d(layers, rec, fmt)  # Generate 2D cross-section
+                write_cable_2d_image(rec, cable_2d_img, fmt)  # store the figure as an image field
         except Exception as e:
             raise ValidationError(str(e))
 
+    def action_export_tds(self):
+        return tds_export_action(self)
+
+    def _get_tds_export_files(self, fmt):
+        """
+            Data sheet of the design and cross-section of the BOM (in its core colors) for the bulk TDS export.
+        """
+        self.ensure_one()
+        image = self.cable_2d_image
+        if not image and self.design_id._get_cable_layers():
+            image = self.design_id._draw_cable_2d(self.design_id.order_line, self, fmt)
+        return tds_export_files(self.display_name, self.tds_html, image)
+
+    def _get_cable_2d_spec(self):
+        """
+            Layout spec of the cross-section drawn by generate_cable_cross_section_image.
+        """
+        self.ensure_one()
+        return self.design_id._get_cable_spec(self.design_id.order_line, self)
+
     def _get_colors(self):  # get referenced colors
         for rec in self:
             if rec.color_codes:
@@ -41,36 +58,22 @@ class BOM(models.Model):
             raise ValidationError(f'reference {rec.color_codes} does not refer to any color.')  # wrong input
 
     def _get_color_by_reference_name(self, color):  # get color hex code
-        if color.lower() == 'bk':
-            result = '#1a1a1a'
-        elif color.lower() == 'bn':
-            result = '#9e360a'
-        elif color.lower() == 'rd':
-            result = '#ff0000'
-        elif color.lower() == 'og':
-            result = '#ffa600'
-        elif color.lower() == 'ye':
-            result = '#ffff00'
-        elif color.lower() == 'gn':
-            result = '#008000'
-        elif color.lower() == 'bu':
-            result = '#0000ff'
-        elif color.lower() == 'vt':
-            result = '#ee82ee'
-        elif color.lower() == 'gy':
-            result = '#808080'
-        elif color.lower() == 'wh':
-            result = '#ffffff'
-        elif color.lower() == 'pk':
-            result = '#FF007F'
-        elif color.lower() == 'tq':
-            result = '#40e0d0'
-        elif color.lower() == 'gnye':
-            result = '#8ee53f'
-        elif color.lower() == 'gd':
-            result = '#ffd700'
-        elif color.lower() == 'sr':
-            result = '#c0c0c0'
-        else:
+        try:
+            return self.env['cable.color']._get_palette().pair(color)[0]
+        except KeyError:
             raise ValidationError(f'{color} is not a color.')
-        return result
+
+    def _get_core_colors(self):
+        """
+            (first, second) hex colors of each core from the color references, 'a/b' or a two-colored code
+            like 'gnye' giving two halves. A BOM without references takes the default core colors of its
+            number of cores.
+        """
+        self.ensure_one()
+        palette = self.env['cable.color']._get_palette()
+        references = not self.color_codes and palette.default_references(self.design_id.no_cores)
+        references = references or self._get_colors()
+        try:
+            return palette.core_colors(references)
+        except KeyError as e:
+            raise ValidationError(f'{e.args[0]} is not a color.')
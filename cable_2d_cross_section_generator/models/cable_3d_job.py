@@ -0,0 +1,109 @@
+from odoo import models, fields, api, _
+import logging
+import time
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+JOBS_PER_RUN = 10
+STALE_AFTER = timedelta(hours=1)  # running jobs older than this were interrupted (worker killed, restart...)
+
+
+class Cable3DJob(models.Model):
+    _name = 'cable.3d.job'
+    _description = 'Cable 3D Model Generation Job'
+    _order = 'id desc'
+
+    STATES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    order_id = fields.Many2one('sale.order', string="Cable Design", required=True, ondelete='cascade', index=True)
+    user_id = fields.Many2one('res.users', string="Requested By", default=lambda self: self.env.user)
+    state = fields.Selection(STATES, string="Status", default='queued', required=True, index=True)
+    date_started = fields.Datetime(string="Started")
+    date_done = fields.Datetime(string="Finished")
+    duration = fields.Float(string="Duration (s)", digits=(16, 2))
+    error = fields.Text(string="Error")
+    attachment_id = fields.Many2one('ir.attachment', string="GLB File", ondelete='set null')
+    file_size = fields.Integer(string="GLB Size (bytes)")
+
+    @api.model
+    def _enqueue(self, orders):
+        """
+            Queue a 3D generation for each order, merging with a job already waiting for the same order.
+        """
+        queued = self.search([('order_id', 'in', orders.ids), ('state', '=', 'queued')])
+        waiting = {job.order_id.id: job for job in queued}
+        jobs = self.browse([waiting[order.id].id for order in orders if order.id in waiting])
+        new_orders = orders.filtered(lambda order: order.id not in waiting)
+        if new_orders:
+            jobs |= self.create([{'order_id': order.id} for order in new_orders])
+        self.env.ref('cable_2d_cross_section_generator.ir_cron_cable_3d_job')._trigger()
+        return jobs
+
+    @api.model
+    def _cron_process_jobs(self):
+        """
+            Run the queued 3D generations, committing after each job so progress is visible right away.
+        """
+        self.search([('state', '=', 'running'), ('date_started', '<', fields.Datetime.now() - STALE_AFTER)]).write({
+            'state': 'failed', 'error': _("The generation was interrupted."), 'date_done': fields.Datetime.now(),
+        })
+        for __ in range(JOBS_PER_RUN):
+            job = self._acquire_next()
+            if not job:
+                return
+            job._run()
+        if self.search_count([('state', '=', 'queued')]):
+            self.env.ref('cable_2d_cross_section_generator.ir_cron_cable_3d_job')._trigger()
+
+    @api.model
+    def _acquire_next(self):
+        self.env.cr.execute("""
+            SELECT id FROM cable_3d_job
+             WHERE state = 'queued'
+          ORDER BY id
+             LIMIT 1
+               FOR UPDATE SKIP LOCKED
+        """)
+        row = self.env.cr.fetchone()
+        if not row:
+            return self.browse()
+        job = self.browse(row[0])
+        job.write({'state': 'running', 'date_started': fields.Datetime.now(), 'error': False})
+        self.env.cr.commit()
+        return job
+
+    def _run(self):
+        self.ensure_one()
+        start = time.perf_counter()
+        try:
+            with self.env.cr.savepoint():
+                self.order_id._generate_cable_3d_model_now()
+            attachment = self.order_id._get_cable_3d_attachment()
+            self.write({
+                'state': 'done',
+                'attachment_id': attachment.id,
+                'file_size': attachment.file_size,
+            })
+        except Exception as e:
+            _logger.exception(f"3D generation job {self.id} for SO {self.order_id.name} failed")
+            self.write({'state': 'failed', 'error': str(e)})
+        self.write({'date_done': fields.Datetime.now(), 'duration': time.perf_counter() - start})
+        self._notify()
+        self.env.cr.commit()
+
+    def _notify(self):
+        for job in self.filtered('user_id'):
+            if job.state == 'done':
+                message = {'type': 'success', 'title': _("3D Model Ready"),
+                           'message': _("The 3D model of %s has been generated.", job.order_id.name)}
+            else:
+                message = {'type': 'danger', 'title': _("3D Model Failed"),
+                           'message': _("The 3D model of %(order)s could not be generated: %(error)s",
+                                        order=job.order_id.name, error=job.error)}
+            self.env['bus.bus']._sendone(job.user_id.partner_id, 'simple_notification', message)
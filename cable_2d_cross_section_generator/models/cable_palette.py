@@ -0,0 +1,112 @@
+from odoo import models, fields, api, tools
+from odoo.exceptions import ValidationError
+
+from ..engine.colors import Palette, hex_to_rgba
+
+
+class CableColor(models.Model):
+    _name = 'cable.color'
+    _description = 'Cable Color'
+    _order = 'sequence, id'
+
+    name = fields.Char(string="Color", required=True)
+    code = fields.Char(string="Reference", required=True,
+                       help="Code of the color in BOM color references, like 'bk' or 'gnye', case-insensitive.")
+    color = fields.Char(string="Hex Color", required=True, default='#808080')
+    secondary_color = fields.Char(string="Second Hex Color",
+                                  help="Second color of two-colored cores (green/yellow), drawn as the other half.")
+    sequence = fields.Integer(default=10)
+    active = fields.Boolean(default=True)
+
+    _sql_constraints = [
+        ('code_uniq', 'unique(code)', 'A color reference is used only once.'),
+    ]
+
+    @api.constrains('code', 'color', 'secondary_color')
+    def _check_colors(self):
+        for rec in self:
+            if not rec.code.strip() or any(char in rec.code for char in ' /'):
+                raise ValidationError(f"Color reference '{rec.code}' cannot be empty or contain spaces or '/'.")
+            for hex_color in (rec.color, rec.secondary_color):
+                try:
+                    hex_color and hex_to_rgba(hex_color)
+                except ValueError as e:
+                    raise ValidationError(str(e))
+
+    @api.model
+    def _normalize_code(self, vals):
+        # references are matched case-insensitively, so 'BK' and 'bk' must hit the unique constraint
+        if vals.get('code'):
+            vals['code'] = vals['code'].strip().lower()
+        return vals
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create([self._normalize_code(dict(vals)) for vals in vals_list])
+        self.env.registry.clear_cache()  # drop the palette
+        return records
+
+    def write(self, vals):
+        res = super().write(self._normalize_code(dict(vals)))
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache()
+    def _get_palette(self):
+        """
+            Palette of the active colors and default core colors, read and prepared once per registry.
+        """
+        colors = self.sudo().search_read([], ['code', 'color', 'secondary_color'])
+        schemes = self.env['cable.core.colors'].sudo().search_read([], ['no_cores', 'color_codes'])
+        return Palette(
+            entries=tuple((color['code'].strip(), color['color'], color['secondary_color'] or '') for color in colors),
+            schemes=tuple((scheme['no_cores'], tuple(scheme['color_codes'].split())) for scheme in schemes),
+        )
+
+
+class CableCoreColors(models.Model):
+    _name = 'cable.core.colors'
+    _description = 'Default Core Colors'
+    _order = 'no_cores'
+
+    no_cores = fields.Integer(string="No. of Cores", required=True)
+    color_codes = fields.Char(string="Core Colors", required=True,
+                              help="Color references of the cores separated by spaces, like 'bu bn bk gy gnye'.")
+
+    _sql_constraints = [
+        ('no_cores_uniq', 'unique(no_cores)', 'Default core colors are set once per number of cores.'),
+    ]
+
+    @api.constrains('no_cores', 'color_codes')
+    def _check_color_codes(self):
+        palette = self.env['cable.color']._get_palette()
+        for rec in self:
+            codes = rec.color_codes.split()
+            if len(codes) != rec.no_cores:
+                raise ValidationError(f'No. of colors {len(codes)} must be equal to No. of cores {rec.no_cores}')
+            try:
+                palette.core_colors(codes)
+            except KeyError as e:
+                raise ValidationError(f'{e.args[0]} is not a color.')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()  # drop the palette
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
@@ -0,0 +1,150 @@
+import psycopg2
+from psycopg2.errors import SerializationFailure
+
+from odoo import models, fields, api
+
+DEFAULT_MAX_SIZE_MB = 200
+COUNTERS = ('render_cache_hits', 'render_cache_misses', 'render_cache_evictions')
+
+
+class CableRenderCache(models.Model):
+    _name = 'cable.render.cache'
+    _description = 'Cable Render Cache'
+    _order = 'last_used desc'
+
+    key = fields.Char(string="Render Key", required=True, index=True, readonly=True)
+    attachment_id = fields.Many2one('ir.attachment', string="Rendered File", ondelete='cascade', readonly=True)
+    file_size = fields.Integer(related='attachment_id.file_size', store=True, string="Size (bytes)")
+    hit_count = fields.Integer(string="Hits", default=0, readonly=True)
+    miss_count = fields.Integer(string="Misses", default=1, readonly=True)
+    last_used = fields.Datetime(string="Last Used", default=fields.Datetime.now, index=True, readonly=True)
+
+    _sql_constraints = [
+        ('key_uniq', 'unique(key)', 'A render is cached only once per key.'),
+    ]
+
+    @api.model
+    def _get_param(self, name, default=0):
+        return self.env['ir.config_parameter'].sudo().get_param(f'cable_2d_cross_section_generator.{name}', default)
+
+    @api.model
+    def _add_counters(self, increments):
+        """
+            Add the hits and misses of evicted entries and the eviction count to the persistent counters.
+
+            Written in SQL: set_param would clear every ormcache of the registry and signal the other workers.
+        """
+        for counter, increment in increments.items():
+            if increment:
+                self.env.cr.execute("""
+                    INSERT INTO ir_config_parameter (key, value, create_uid, create_date, write_uid, write_date)
+                    VALUES (%(key)s, %(text)s, %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC')
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = (COALESCE(NULLIF(ir_config_parameter.value, ''), '0')::integer + %(value)s)::varchar
+                """, {'key': f'cable_2d_cross_section_generator.{counter}', 'value': increment, 'text': str(increment),
+                      'uid': self.env.uid})
+
+    @api.model
+    def _get_stats(self):
+        """
+            Hits, misses (renders stored) and evictions since the last clear, with the live entries and their size.
+        """
+        self.env.cr.execute("SELECT key, value FROM ir_config_parameter WHERE key IN %s",
+                            [tuple(f'cable_2d_cross_section_generator.{counter}' for counter in COUNTERS)])
+        counters = {key.rsplit('.', 1)[1]: int(value or 0) for key, value in self.env.cr.fetchall()}
+        entries = self.sudo().search([])
+        return {
+            'hits': counters.get('render_cache_hits', 0) + sum(entries.mapped('hit_count')),
+            'misses': counters.get('render_cache_misses', 0) + sum(entries.mapped('miss_count')),
+            'evictions': counters.get('render_cache_evictions', 0),
+            'entries': len(entries),
+            'size': sum(entries.mapped('file_size')),
+        }
+
+    @api.model
+    def _lookup(self, key):
+        """
+            Return the cached base64 file for the key, or False on a miss.
+
+            The hit is counted in plain SQL on a best-effort basis: when another request is updating the same
+            entry, its update stands for both instead of serializing the reads of a popular design.
+        """
+        entry = self.sudo().search([('key', '=', key)], limit=1)
+        if not entry or not entry.attachment_id.datas:
+            return False
+        try:
+            with self.env.cr.savepoint(flush=False):
+                self.env.cr.execute("""
+                    UPDATE cable_render_cache SET hit_count = hit_count + 1, last_used = now() at time zone 'UTC'
+                    WHERE id IN (SELECT id FROM cable_render_cache WHERE id = %s FOR UPDATE SKIP LOCKED)
+                """, [entry.id])
+        except SerializationFailure:
+            pass
+        return entry.attachment_id.datas
+
+    @api.model
+    def _store(self, key, datas, mimetype='image/png'):
+        """
+            Keep a rendered base64 file under its key, then evict old entries over the size limit.
+
+            A design rendered by two requests at once is stored by the first one to commit, the other keeps its
+            image without failing on the unique key.
+        """
+        cache = self.sudo()
+        attachment = self.env['ir.attachment'].sudo().create({
+            'name': f'{key}.{mimetype.split("/")[-1].split("+")[0]}',
+            'type': 'binary',
+            'datas': datas,
+            'res_model': self._name,
+            'mimetype': mimetype,
+        })
+        entry = cache.search([('key', '=', key)], limit=1)
+        if entry:
+            previous = entry.attachment_id
+            entry.write({'attachment_id': attachment.id, 'miss_count': entry.miss_count + 1,
+                         'last_used': fields.Datetime.now()})
+            previous.unlink()
+        else:
+            try:
+                with self.env.cr.savepoint():
+                    entry = cache.create({'key': key, 'attachment_id': attachment.id})
+            except psycopg2.IntegrityError:
+                attachment.unlink()
+                return cache.search([('key', '=', key)], limit=1)
+        attachment.res_id = entry.id
+        cache._evict()
+        return entry
+
+    @api.model
+    def _evict(self):
+        """
+            Drop the least recently used entries until the cache fits the configured size.
+        """
+        max_size = float(self._get_param('render_cache_max_size_mb', DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+        entries = self.sudo().search([], order='last_used desc, id desc')
+        total = 0
+        stale = self.browse()
+        for entry in entries:
+            total += entry.file_size
+            if total > max_size:
+                stale |= entry
+        if stale:
+            self._add_counters({
+                'render_cache_hits': sum(stale.mapped('hit_count')),
+                'render_cache_misses': sum(stale.mapped('miss_count')),
+                'render_cache_evictions': len(stale),
+            })
+            stale.mapped('attachment_id').unlink()
+            stale.exists().unlink()
+
+    def unlink(self):
+        attachments = self.mapped('attachment_id')
+        res = super().unlink()
+        attachments.exists().unlink()
+        return res
+
+    @api.model
+    def action_clear_cache(self):
+        self.sudo().search([]).unlink()
+        self.env.cr.execute("DELETE FROM ir_config_parameter WHERE key IN %s",
+                            [tuple(f'cable_2d_cross_section_generator.{counter}' for counter in COUNTERS)])
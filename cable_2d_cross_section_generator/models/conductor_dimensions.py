@@ -0,0 +1,87 @@
+from odoo import models, api, tools
+
+INDEXED_TYPES = ('char', 'text', 'selection', 'integer', 'float', 'monetary')
+
+
+class ConductorDimensions(models.Model):
+    _inherit = 'conductor.dimensions'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()  # drop the lookup index
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    def _find(self, criteria):
+        """
+            First conductor dimension matching all the (column, value) criteria, like a ``search`` with
+            ``limit=1`` on the equivalent '=' domain, answered from the in-memory index.
+        """
+        return self._find_many([criteria])[0]
+
+    @api.model
+    def _find_many(self, criteria_list):
+        """
+            Resolve many criteria lists at once, each to a (possibly empty) conductor dimension.
+
+            The index of a set of columns is built from one query the first time it is needed, then every
+            lookup is a dictionary hit until the table is written.
+        """
+        ids = []
+        for criteria in criteria_list:
+            values = {}
+            for column, value in criteria:
+                if values.setdefault(column, value) != value:  # the same column asked twice with two values
+                    values = None
+                    break
+            if values is None:
+                ids.append(False)
+                continue
+            columns = tuple(sorted(values))
+            index = self._get_index(columns)
+            key = self._index_key(columns, [values[column] for column in columns]) if index is not None else None
+            if key is None:  # columns or values the index cannot compare like the database, ask it
+                domain = [(column, '=', value) for column, value in values.items()]
+                ids.append(self.search(domain, limit=1).id)
+            else:
+                ids.append(index.get(key, False))
+        found = [record_id for record_id in ids if record_id]
+        return [self.browse(record_id or ()).with_prefetch(found) for record_id in ids]
+
+    @api.model
+    @tools.ormcache('columns')
+    def _get_index(self, columns):
+        # {values: id} of the first record in search order for each combination of the columns
+        if not all(column in self._fields and self._fields[column].type in INDEXED_TYPES for column in columns):
+            return None
+        index = {}
+        rows = self.sudo().with_context(active_test=True).search_read([], list(columns) or ['id'], order=self._order)
+        for row in rows:
+            index.setdefault(self._index_key(columns, [row[column] for column in columns]), row['id'])
+        return index
+
+    @api.model
+    def _index_key(self, columns, values):
+        key = []
+        for column, value in zip(columns, values):
+            if value is False or value is None:
+                key.append(None)
+            elif self._fields[column].type in ('integer', 'float', 'monetary'):
+                try:
+                    key.append(float(value))
+                except (TypeError, ValueError):
+                    return None
+            else:
+                key.append(str(value))
+        return tuple(key)
@@ -1,28 +1,49 @@
-from odoo import models, fields
+from odoo import models, fields, api, tools
 from odoo.exceptions import ValidationError
 
+from ..engine.layup import Layup, solve_layup
+
 
 class LayupDiameterMultiplicationFactor(models.Model):
     _inherit = "lu.diameter.multiplication.factor"
 
-    def _get_layup_configuration(self, no_cores):
-        """Get the layup configuration for a given number of cores"""
-        config = self.env['lu.diameter.multiplication.factor'].search([('no_cores', '=', no_cores)], limit=1)
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env.registry.clear_cache()  # drop the resolved layups
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
+
+    @api.model
+    @tools.ormcache('no_cores', 'pitch_ratio')
+    def _get_layup(self, no_cores, pitch_ratio=1.0):
+        """
+            Ring structure of the layup for a number of cores, read once per registry and pitch ratio.
+
+            Rings come from the l1, l2... columns in order, as many as the table has. The table holds touching
+            cores, so other pitch ratios and the core counts missing from it are laid up by the circle-packing
+            solver.
+
+            :param pitch_ratio: Distance between neighbouring cores of a ring, in core diameters.
+        """
+        config = pitch_ratio == 1.0 and self.sudo().search([('no_cores', '=', no_cores)], limit=1)
         if not config:
-            raise ValidationError(f"No layup configuration found for {no_cores} cores.")
-
-        layers = []
-        if config.l1 > 0:
-            layers.append(config.l1)
-        if config.l2 > 0:
-            layers.append(config.l2)
-        if config.l3 > 0:
-            layers.append(config.l3)
-        if config.l4 > 0:
-            layers.append(config.l4)
-        if config.l5 > 0:
-            layers.append(config.l5)
-        if config.l6 > 0:
-            layers.append(config.l6)
-
-        return layers, config
+            if no_cores < 1:
+                raise ValidationError(f"No layup configuration found for {no_cores} cores.")
+            return solve_layup(no_cores, pitch_ratio)
+        rings = []
+        ring = 1
+        while f'l{ring}' in self._fields:
+            if config[f'l{ring}'] > 0:
+                rings.append(config[f'l{ring}'])
+            ring += 1
+        return Layup(tuple(rings), config.multiplier_factor)
@@ -0,0 +1,42 @@
+from odoo import models, fields
+
+from .cable_2d_cross_section import FORMAT_PARAM
+from .cable_3d_modeling import GLB_EXPORT_MODES, GLB_EXPORT_PARAM, GLB_QUANTIZE_PARAM
+from .cable_render_cache import DEFAULT_MAX_SIZE_MB
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = 'res.config.settings'
+
+    cable_cross_section_format = fields.Selection(
+        [('png', 'PNG (raster)'), ('svg', 'SVG (vector)')], string="Cross-Section Format", default='png',
+        config_parameter=FORMAT_PARAM,
+        help="SVG is written straight from the layout: much smaller files, faster and sharp at any zoom.")
+    cable_3d_export_mode = fields.Selection(
+        GLB_EXPORT_MODES, string="3D Export Mode", default='gpu', config_parameter=GLB_EXPORT_PARAM,
+        help="GPU instancing stores each wire and strand shape once and draws all its copies in one call. "
+             "Node instancing does the same for viewers without the EXT_mesh_gpu_instancing extension.")
+    cable_3d_quantize = fields.Boolean(
+        string="Compress 3D Models", config_parameter=GLB_QUANTIZE_PARAM,
+        help="Store instanced models with 16-bit positions (KHR_mesh_quantization) and merged vertices.")
+    cable_render_cache_max_size_mb = fields.Integer(
+        string="Render Cache Size (MB)", default=DEFAULT_MAX_SIZE_MB,
+        config_parameter='cable_2d_cross_section_generator.render_cache_max_size_mb',
+        help="Least recently used cross-section renders are evicted above this size.")
+    cable_render_cache_hits = fields.Integer(string="Cache Hits", compute="_compute_cable_render_cache_stats")
+    cable_render_cache_misses = fields.Integer(string="Cache Misses", compute="_compute_cable_render_cache_stats")
+    cable_render_cache_evictions = fields.Integer(string="Evictions", compute="_compute_cable_render_cache_stats")
+    cable_render_cache_entries = fields.Integer(string="Cached Renders", compute="_compute_cable_render_cache_stats")
+    cable_render_cache_size_kb = fields.Integer(string="Cache Size (KB)", compute="_compute_cable_render_cache_stats")
+
+    def _compute_cable_render_cache_stats(self):
+        stats = self.env['cable.render.cache'].sudo()._get_stats()
+        for rec in self:
+            rec.cable_render_cache_hits = stats['hits']
+            rec.cable_render_cache_misses = stats['misses']
+            rec.cable_render_cache_evictions = stats['evictions']
+            rec.cable_render_cache_entries = stats['entries']
+            rec.cable_render_cache_size_kb = stats['size'] // 1024
+
+    def action_clear_cable_render_cache(self):
+        self.env['cable.render.cache'].action_clear_cache()
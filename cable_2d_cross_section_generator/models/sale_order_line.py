@@ -18,24 +18,29 @@ class SaleOrderLine(models.Model):
     @api.depends('product_template_attribute_value_ids')
     def _compute_conductor_dimension_id(self):
         """
-            Get conductor shape type from the related conductor dimension.
+            Get conductor shape type from the related conductor dimension, resolved for all lines at once.
         """
-        for rec in self:
-            conductor_shape = ''
-            domains = []
-            record = self.env['conductor.dimensions']
-            if rec.product_template_id.cable_type in ['phase_conductor', 'neutral_conductor']:
-                attrs = rec.order_id.get_product_attributes(rec.product_template_attribute_value_ids)
-                for k, v in attrs.items():
-                    for item in rec.product_template_id.diameter_selection:
-                        if item.condition_attribute.name == k:
-                            if k == 'Conductor Shape':
-                                conductor_shape = v
-                            if k == 'Conductor Material':
-                                conductor_material = v
-                            domains.append((item.match_with_column.name, '=', v))
-                            if conductor_shape == 'Shaped':
-                                domains.append(('no_cores', '=', rec.product_uom_qty))
-                record = record.search(domains, limit=1)
+        conductor_lines = self.filtered(
+            lambda rec: rec.product_template_id.cable_type in ['phase_conductor', 'neutral_conductor'])
+        records = self.env['conductor.dimensions']._find_many(
+            [rec._get_conductor_dimension_criteria() for rec in conductor_lines])
+        for rec, record in zip(conductor_lines, records):
+            rec.conductor_dimension_id = record
 
-                rec.conductor_dimension_id = record
+    def _get_conductor_dimension_criteria(self):
+        """
+            (column, value) pairs matching the line attributes to a conductor dimension.
+        """
+        self.ensure_one()
+        conductor_shape = ''
+        criteria = []
+        attrs = self.order_id.get_product_attributes(self.product_template_attribute_value_ids)
+        for k, v in attrs.items():
+            for item in self.product_template_id.diameter_selection:
+                if item.condition_attribute.name == k:
+                    if k == 'Conductor Shape':
+                        conductor_shape = v
+                    criteria.append((item.match_with_column.name, v))
+                    if conductor_shape == 'Shaped':
+                        criteria.append(('no_cores', self.product_uom_qty))
+        return criteria
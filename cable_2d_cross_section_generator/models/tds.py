@@ -1,14 +1,187 @@
+import base64
+
+from markupsafe import escape
+
 from odoo import models, fields, api
 
+# every order and line field printed by tds_html_template, keep in sync with data/tds.xml
+TDS_DEPENDS = (
+    'short_description',
+    'product_standard.name',
+    'lead_sheath_std',
+    'total_weight',
+    'order_line',
+    'order_line.product_template_id.name',
+    'order_line.product_template_id.cable_type',
+    'order_line.product_template_id.cable_layer_type_id',
+    'order_line.product_template_attribute_value_ids.attribute_id.name',
+    'order_line.product_template_attribute_value_ids.product_attribute_value_id.name',
+    'order_line.product_template_attribute_value_ids.product_attribute_value_id.short_name',
+    'order_line.conductor_dimension_id.no_wires',
+    'order_line.conductor_dimension_id.wire_size',
+    'order_line.product_uom_qty',
+    'order_line.thickness',
+    'order_line.thickness_min',
+    'order_line.diameter',
+    'order_line.weight',
+    'order_line.armour_no_wires',
+)
+
+TDS_CORE_TYPES = ('phase_conductor', 'neutral_conductor', 'phase_insulation', 'neutral_insulation')
+TDS_FILLER_LAYER = 'Laying up with Fillers'
+# attribute groups printed by the template: key: (attribute names, whole attribute name or a part of it)
+TDS_ATTRIBUTES = {
+    'Conductor Material': (('Conductor Material',), False),
+    'Conductor Class Name': (('Conductor Class Name',), False),
+    'Conductor Shape': (('Conductor Shape',), False),
+    'Voltage': (('Voltage',), False),
+    'Insulation Material': (('Insulation Material',), False),
+    'Type': (('Type',), False),
+    'Location': (('Location',), False),
+    'Size': (('Size',), False),
+    'Screen': (('Screen',), False),
+    'Thickness': (('Thickness',), False),
+    'Width': (('Width',), False),
+    'Overlap': (('Overlap',), False),
+    'Inner Sheath Tape': (('Inner Sheath Tape',), True),
+    'Sheath Material': (('Inner Sheath Material', 'Bedding Material', 'Sheathing Material'), True),
+    'Sheath Material Type': (('Inner Sheath Material Type', 'Bedding Material Type', 'Sheathing Material Type'), True),
+    'Extrusion Type': (('Extrusion Type',), True),
+    'Colour': (('Colour', 'Color'), False),
+    'Master Batch': (('Master Batch',), False),
+    'Metal Sheath Material': (('Metal Sheath Material',), True),
+    'Material': (('Material',), False),
+    'Armour Type': (('Armour Type',), True),
+    'Armour Type Shape': (('Armour Type Shape',), True),
+    'Tape Width': (('Tape Width',), False),
+    'Additive Type': (('Additive Type',), True),
+    'Additive Percent': (('Additive Percent',), True),
+}
+TDS_EXPORT_URL = '/cable_2d_cross_section_generator/tds_export/{export_id}'
+TDS_EXPORT_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"/><title>{title}</title></head>
+<body>{image}{tds}</body></html>
+"""
+
+
+def tds_export_action(records):
+    """
+        Download the data sheets of the records as one ZIP, streamed by the tds_export route.
+
+        The selection is kept in a cable.tds.export record and only its id goes in the URL, so the size of the
+        selection is not limited by the URL length.
+    """
+    export = records.env['cable.tds.export'].create({
+        'res_model': records._name,
+        'res_ids': ','.join(str(record_id) for record_id in records.ids),
+    })
+    return {
+        'type': 'ir.actions.act_url',
+        'url': TDS_EXPORT_URL.format(export_id=export.id),
+        'target': 'self',
+    }
+
+
+def tds_export_files(title, tds_html, image):
+    """
+        Files of one record in the bulk TDS export: its cross-section image, if any, and an HTML page showing
+        it above the data sheet.
+
+        :param image: base64 PNG or SVG, or False.
+        :return: list of (file name, content bytes).
+    """
+    files = []
+    image_tag = ''
+    if image:
+        data = base64.b64decode(image)
+        name = 'cross_section.png' if data.startswith(b'\x89PNG') else 'cross_section.svg'
+        files.append((name, data))
+        image_tag = f'<p style="text-align:center;"><img src="{name}" alt="{escape(title)}"/></p>'
+    page = TDS_EXPORT_PAGE.format(title=escape(title), image=image_tag, tds=tds_html or '')
+    files.append(('tds.html', page.encode()))
+    return files
+
 
 class SaleOrder(models.Model):
     _inherit = 'sale.order'
 
-    tds_html = fields.Html(string="TDS Details", compute="_compute_tds_html", sanitize=False)
+    tds_html = fields.Html(string="TDS Details", compute="_compute_tds_html", sanitize=False, store=True)
 
-    @api.depends('order_line')
+    @api.depends(*TDS_DEPENDS)
     def _compute_tds_html(self):
+        """
+            Render the technical data sheet, stored so reads and exports don't run the template again.
+            Recomputed only when a field the template prints changes, see TDS_DEPENDS.
+        """
         for order in self:
             order.tds_html = order.env['ir.qweb']._render('cable_2d_cross_section_generator.tds_html_template', {
                 'order': order
             })
+
+    def _get_tds_values(self):
+        """
+            View-model of tds_html_template, built in one pass over the lines and their attribute values.
+
+            :return: dict with the 'core_lines' (conductors and insulations), 'filler_lines' and 'other_lines'
+                     recordsets, 'titles' (layer title of each line id), 'attributes' (line id: TDS_ATTRIBUTES
+                     key: matching product.template.attribute.value recordset) and 'has_layers'.
+        """
+        self.ensure_one()
+        standard = self.product_standard.name or ''
+        separator = '5467' if '5467' in standard else standard
+        groups = {'core_lines': [], 'filler_lines': [], 'other_lines': []}
+        titles, attributes = {}, {}
+        has_layers = False
+        for line in self.order_line:
+            template = line.product_template_id
+            name = template.name or ''
+            is_core = template.cable_type in TDS_CORE_TYPES
+            is_filler = TDS_FILLER_LAYER in name
+            if is_core:
+                groups['core_lines'].append(line.id)
+            if is_filler:
+                groups['filler_lines'].append(line.id)
+            if not is_core and not is_filler:
+                groups['other_lines'].append(line.id)
+            has_layers = has_layers or bool(template.cable_layer_type_id)
+            titles[line.id] = name.split(separator)[0] if separator else name
+
+            values = line.product_template_attribute_value_ids
+            matches = {key: [] for key in TDS_ATTRIBUTES}
+            for value in values:
+                attribute = value.attribute_id.name or ''
+                for key, (names, exact) in TDS_ATTRIBUTES.items():
+                    if any(attribute == part if exact else part in attribute for part in names):
+                        matches[key].append(value.id)
+            attributes[line.id] = {key: values.browse(ids) for key, ids in matches.items()}
+
+        result = {group: self.order_line.browse(ids) for group, ids in groups.items()}
+        result.update(titles=titles, attributes=attributes, has_layers=has_layers)
+        return result
+
+    def action_export_tds(self):
+        return tds_export_action(self)
+
+    def _get_tds_export_files(self, fmt):
+        """
+            Data sheet and cross-section of the order for the bulk TDS export, the image rendered (through the
+            render cache) when it was never generated.
+        """
+        self.ensure_one()
+        image = self.cable_2d_image
+        layers = self._get_cable_layers()
+        if not image and layers:
+            image = self._draw_cable_2d(layers, False, fmt)
+        return tds_export_files(self.name, self.tds_html, image)
+
+
+class TdsExport(models.TransientModel):
+    _name = 'cable.tds.export'
+    _description = 'Technical Data Sheet Export'
+
+    res_model = fields.Char(string="Model", required=True)
+    res_ids = fields.Text(string="Record IDs", required=True)
+
+    def _get_records(self):
+        self.ensure_one()
+        return self.env[self.res_model].browse(int(record_id) for record_id in self.res_ids.split(',') if record_id)
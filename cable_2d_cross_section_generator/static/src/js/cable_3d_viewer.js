@@ -0,0 +1,50 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { standardFieldProps } from "@web/views/fields/standard_field_props";
+import { Component, useState, onWillUpdateProps } from "@odoo/owl";
+
+/**
+ * Shows the GLB served by the 3D model route. The field holds the URL, not the file: the form loads
+ * nothing until the 3D tab mounts this component, then the browser fetches (and caches) the model.
+ * With a preview field, the light variant is shown first and replaced by the full model once loaded.
+ */
+export class Cable3DViewerField extends Component {
+    static template = "cable_2d_cross_section_generator.Cable3DViewerField";
+    static props = {
+        ...standardFieldProps,
+        previewField: { type: String, optional: true },
+    };
+
+    setup() {
+        this.state = useState({ src: this.initialSrc(this.props) });
+        onWillUpdateProps((nextProps) => {
+            if (nextProps.record.data[nextProps.name] !== this.props.record.data[this.props.name]) {
+                this.state.src = this.initialSrc(nextProps);
+            }
+        });
+    }
+
+    initialSrc(props) {
+        const preview = props.previewField && props.record.data[props.previewField];
+        return preview || props.record.data[props.name];
+    }
+
+    onLoad() {
+        const url = this.props.record.data[this.props.name];
+        if (url && this.state.src !== url) {
+            this.state.src = url;  // the preview is on screen, swap in the full model
+        }
+    }
+}
+
+export const cable3DViewerField = {
+    component: Cable3DViewerField,
+    displayName: "3D Model Viewer",
+    supportedTypes: ["char"],
+    extractProps: ({ options }) => ({
+        previewField: options.preview_field,
+    }),
+};
+
+registry.category("fields").add("cable_3d_viewer", cable3DViewerField);
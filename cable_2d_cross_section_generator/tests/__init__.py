@@ -0,0 +1,3 @@
+from . import test_cable_2d_image
+from . import test_cable_palette
+from . import test_cable_render_cache
@@ -0,0 +1,38 @@
+import base64
+
+from odoo.exceptions import AccessError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+from ..models.cable_2d_cross_section import write_cable_2d_image
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><circle cx="5" cy="5" r="4"/></svg>'
+
+
+@tagged('post_install', '-at_install')
+class TestCable2DImage(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.salesman = new_test_user(cls.env, login='cable_2d_salesman',
+                                     groups='base.group_user,sales_team.group_sale_salesman_all_leads')
+        partner = cls.env['res.partner'].create({'name': 'Cable Customer'})
+        cls.order = cls.env['sale.order'].create({'partner_id': partner.id})
+
+    def _image_attachment(self):
+        return self.env['ir.attachment'].sudo().search([
+            ('res_model', '=', 'sale.order'), ('res_id', '=', self.order.id), ('res_field', '=', 'cable_2d_image'),
+        ])
+
+    def test_svg_written_by_salesman_is_stored_as_svg(self):
+        self.assertFalse(self.salesman._is_admin())
+        write_cable_2d_image(self.order.with_user(self.salesman), base64.b64encode(SVG), 'svg')
+        attachment = self._image_attachment()
+        self.assertEqual(attachment.mimetype, 'image/svg+xml')
+        self.assertEqual(attachment.raw, SVG)
+
+    def test_svg_needs_write_access(self):
+        reader = new_test_user(self.env, login='cable_2d_reader', groups='base.group_portal')
+        with self.assertRaises(AccessError):
+            write_cable_2d_image(self.order.with_user(reader), base64.b64encode(SVG), 'svg')
+        self.assertFalse(self._image_attachment())
@@ -0,0 +1,20 @@
+from psycopg2 import IntegrityError
+
+from odoo.tests import TransactionCase, tagged
+from odoo.tools import mute_logger
+
+
+@tagged('post_install', '-at_install')
+class TestCablePalette(TransactionCase):
+
+    def test_codes_are_stored_lowercase(self):
+        color = self.env['cable.color'].create({'name': 'Test Magenta', 'code': ' MG ', 'color': '#ff00ff'})
+        self.assertEqual(color.code, 'mg')
+        color.write({'code': 'MgT'})
+        self.assertEqual(color.code, 'mgt')
+        self.assertEqual(self.env['cable.color']._get_palette().pair('MGT'), ('#ff00ff', '#ff00ff'))
+
+    def test_codes_differing_in_case_are_duplicates(self):
+        self.env['cable.color'].create({'name': 'Test Magenta', 'code': 'mg', 'color': '#ff00ff'})
+        with mute_logger('odoo.sql_db'), self.assertRaises(IntegrityError), self.cr.savepoint():
+            self.env['cable.color'].create({'name': 'Test Magenta 2', 'code': 'MG', 'color': '#ee00ee'})
@@ -0,0 +1,32 @@
+import base64
+
+from odoo.tests import TransactionCase, tagged
+
+PNG = base64.b64encode(b'\x89PNG\r\n\x1a\nrender')
+
+
+@tagged('post_install', '-at_install')
+class TestCableRenderCache(TransactionCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = self.env['cable.render.cache']
+        self.cache.action_clear_cache()
+
+    def test_hits_are_counted(self):
+        entry = self.cache._store('test-key', PNG)
+        self.assertFalse(self.cache._lookup('missing-key'))
+        for __ in range(3):
+            self.assertEqual(self.cache._lookup('test-key'), PNG)
+        entry.invalidate_recordset(['hit_count'])
+        self.assertEqual(entry.hit_count, 3)
+        stats = self.cache._get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (3, 1, 1))
+
+    def test_storing_a_key_again_replaces_its_file(self):
+        entry = self.cache._store('test-key', PNG)
+        first = entry.attachment_id
+        again = self.cache._store('test-key', base64.b64encode(b'\x89PNG\r\n\x1a\nnew'))
+        self.assertEqual(again, entry)
+        self.assertFalse(first.exists())
+        self.assertEqual(entry.miss_count, 2)
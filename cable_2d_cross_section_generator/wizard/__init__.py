@@ -0,0 +1 @@
+from . import cable_batch_render
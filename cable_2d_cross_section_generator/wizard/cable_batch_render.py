@@ -0,0 +1,121 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError
+
+from ..engine.batch import MAX_WORKERS, default_workers, render_specs
+from ..engine.render import FORMATS, render_key
+from ..models.cable_2d_cross_section import write_cable_2d_image
+
+
+class CableBatchRenderWizard(models.TransientModel):
+    _name = 'cable.batch.render.wizard'
+    _description = 'Batch Cable Cross-Section Generation'
+
+    sale_order_ids = fields.Many2many('sale.order', string="Cable Designs")
+    bom_ids = fields.Many2many('mrp.bom', string="Bills of Materials")
+    max_workers = fields.Integer(string="Parallel Workers", default=lambda self: default_workers(),
+                                 help=f"Number of rendering threads, at most {MAX_WORKERS}.")
+    use_cache = fields.Boolean(string="Reuse Cached Renders", default=True)
+    state = fields.Selection([('draft', 'Draft'), ('done', 'Done')], default='draft')
+    line_ids = fields.One2many('cable.batch.render.wizard.line', 'wizard_id', string="Results")
+    summary = fields.Char(compute="_compute_summary")
+
+    @api.depends('line_ids.state')
+    def _compute_summary(self):
+        for wizard in self:
+            states = wizard.line_ids.mapped('state')
+            wizard.summary = _("%(done)s generated, %(cached)s reused from cache, %(failed)s failed",
+                               done=states.count('done'), cached=states.count('cached'),
+                               failed=states.count('failed'))
+
+    @api.model
+    def action_open_for(self, records):
+        """
+            Open the wizard on the selected sale orders or BOMs (used by the server actions).
+        """
+        field_name = 'bom_ids' if records._name == 'mrp.bom' else 'sale_order_ids'
+        wizard = self.create({field_name: [(6, 0, records.ids)]})
+        return wizard._reopen()
+
+    def _reopen(self):
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _('Generate Cross-Sections'),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def action_render(self):
+        """
+            Snapshot every design, render the distinct ones in a thread pool and write the images back.
+        """
+        self.ensure_one()
+        targets = list(self.sale_order_ids) + list(self.bom_ids)
+        if not targets:
+            raise UserError(_("Select at least one cable design or bill of materials."))
+        cache = self.env['cable.render.cache']
+        fmt = self.env['sale.order']._get_cable_2d_format()
+        record_keys = []  # (record, key or False, error)
+        specs, images, cached_keys = {}, {}, set()
+        for record in targets:
+            try:
+                with self.env.cr.savepoint():
+                    spec = record._get_cable_2d_spec()
+            except Exception as e:
+                record_keys.append((record, False, str(e)))
+                continue
+            key = render_key(spec, fmt)
+            record_keys.append((record, key, False))
+            if key in specs or key in images:
+                continue  # identical designs are rendered once
+            cached_image = self.use_cache and cache._lookup(key)
+            if cached_image:
+                images[key] = cached_image
+                cached_keys.add(key)
+            else:
+                specs[key] = spec
+
+        errors = {}
+        for key, image, error in render_specs(specs, min(max(self.max_workers, 1), MAX_WORKERS), fmt=fmt):
+            if error:
+                errors[key] = error
+            else:
+                images[key] = image
+                cache._store(key, image, FORMATS[fmt])
+
+        # write back in bulk, one write per model and image
+        groups = {}
+        for record, key, error in record_keys:
+            if key in images:
+                groups.setdefault((record._name, key), []).append(record.id)
+        for (model, key), ids in groups.items():
+            write_cable_2d_image(self.env[model].browse(ids), images[key], fmt)
+
+        lines = []
+        for record, key, error in record_keys:
+            if key in images:
+                state, message = ('cached', False) if key in cached_keys else ('done', False)
+            else:
+                state, message = 'failed', error or errors.get(key)
+            lines.append((0, 0, {
+                'res_model': record._name,
+                'res_id': record.id,
+                'name': record.display_name,
+                'state': state,
+                'message': message,
+            }))
+        self.write({'line_ids': [(5, 0, 0)] + lines, 'state': 'done'})
+        return self._reopen()
+
+
+class CableBatchRenderWizardLine(models.TransientModel):
+    _name = 'cable.batch.render.wizard.line'
+    _description = 'Batch Cable Cross-Section Generation Result'
+
+    wizard_id = fields.Many2one('cable.batch.render.wizard', required=True, ondelete='cascade')
+    res_model = fields.Char(string="Model")
+    res_id = fields.Integer(string="Record ID")
+    name = fields.Char(string="Design")
+    state = fields.Selection([('done', 'Generated'), ('cached', 'Reused'), ('failed', 'Failed')], string="Status")
+    message = fields.Text(string="Error")
@@ -0,0 +1,14 @@
+"""
+    The tests cover the layout engine, which has no Odoo dependency, so they run without a database:
+
+        python -m pytest tests
+
+    Designs come from the synthetic cables of the benchmarks.
+"""
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (os.path.join(ROOT_DIR, 'cable_2d_cross_section_generator'), os.path.join(ROOT_DIR, 'benchmarks')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,40 @@
+import base64
+import dataclasses
+import threading
+
+import pytest
+from designs import synthetic_cable
+
+from engine import batch
+from engine.render import render_spec
+
+
+def test_render_specs_matches_serial_renders():
+    specs = {cores: synthetic_cable(cores) for cores in (1, 2, 3, 4, 5)}
+    results = {key: (image, error) for key, image, error in batch.render_specs(specs, max_workers=4)}
+    assert results.keys() == specs.keys()
+    for key, spec in specs.items():
+        assert results[key] == (render_spec(spec), None)
+
+
+@pytest.mark.parametrize('max_workers', (1, 3))
+def test_failing_spec_does_not_stop_the_batch(max_workers):
+    specs = {'good': synthetic_cable(3), 'empty': dataclasses.replace(synthetic_cable(3), layers=())}
+    results = {key: (image, error) for key, image, error in batch.render_specs(specs, max_workers)}
+    assert results['empty'] == (False, 'No cable layers found to lay out.')
+    assert base64.b64decode(results['good'][0]).startswith(b'\x89PNG')
+    assert results['good'][1] is None
+
+
+def test_render_specs_runs_in_threads(monkeypatch):
+    threads = set()
+
+    def render(spec, fmt):
+        threads.add(threading.get_ident())
+        return fmt
+
+    monkeypatch.setattr(batch, 'render_spec', render)
+    results = list(batch.render_specs({key: None for key in range(20)}, max_workers=4, fmt='svg'))
+    assert sorted(key for key, __, __ in results) == list(range(20))
+    assert all(image == 'svg' for __, image, __ in results)
+    assert threading.get_ident() not in threads
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from engine.colors import DEFAULT_RGBA, Palette, darken_hex_color, hex_to_rgba, rgba_array
+
+PALETTE = Palette(
+    entries=(('bk', '#1a1a1a', ''), ('bn', '#9e360a', ''), ('gnye', '#008000', '#ffff00'), ('BU', '#0000ff', '')),
+    schemes=((3, ('bn', 'bk', 'gnye')), (5, ('bu', 'bn', 'bk', 'bk', 'gnye'))),
+)
+
+
+def test_pair_of_single_two_colored_and_split_references():
+    assert PALETTE.pair('bk') == ('#1a1a1a', '#1a1a1a')
+    assert PALETTE.pair(' GnYe ') == ('#008000', '#ffff00')
+    assert PALETTE.pair('bn/bu') == ('#9e360a', '#0000ff')
+    with pytest.raises(KeyError):
+        PALETTE.pair('zz')
+
+
+def test_core_colors_resolve_every_reference():
+    assert PALETTE.core_colors(['bu', 'gnye']) == (('#0000ff', '#0000ff'), ('#008000', '#ffff00'))
+
+
+def test_default_references_repeat_the_largest_scheme():
+    assert PALETTE.default_references(3) == ('bn', 'bk', 'gnye')
+    assert PALETTE.default_references(7) == ('bu', 'bn', 'bk', 'bk', 'gnye', 'bu', 'bn')
+    assert PALETTE.default_references(0) == ()
+    assert Palette(entries=()).default_references(4) == ()
+
+
+def test_invalid_palette_color_fails_when_built():
+    with pytest.raises(ValueError):
+        Palette(entries=(('bk', '#12345', ''),))
+
+
+def test_hex_colors():
+    assert hex_to_rgba('#ff8000') == (255, 128, 0, 255)
+    assert hex_to_rgba('ff800080') == (255, 128, 0, 128)
+    assert darken_hex_color('#c86432', 50) == '#643219'
+    assert darken_hex_color('#0000c8', 0) == '#0000c8'
+
+
+def test_darkened_shades_are_computed_once():
+    darken_hex_color('#123456', 30)
+    hits = darken_hex_color.cache_info().hits
+    assert darken_hex_color('#123456', 30) == '#0c243c'
+    assert darken_hex_color.cache_info().hits == hits + 1
+
+
+def test_rgba_array_parses_each_color_once_and_falls_back_on_invalid_ones():
+    colors = ['#ff0000', 'nope', '#ff0000', '#00ff0080']
+    table = rgba_array(colors)
+    assert table.dtype == np.uint8
+    assert table.tolist() == [[255, 0, 0, 255], list(DEFAULT_RGBA), [255, 0, 0, 255], [0, 255, 0, 128]]
@@ -0,0 +1,128 @@
+"""
+    ``data/legacy_layouts.json`` holds the patches and annotations drawn by ``sale.order._draw_cable_2d`` as it
+    was before the layout moved to the engine, run on stub order lines for the designs below. The engine
+    must paint the same shapes, in the same order and style, and place the same labels.
+
+    Sector outlines are only compared by area and bounds: the old code sampled the arc on 100 points and
+    buffered it, the engine outlines it in closed form.
+"""
+import json
+import os
+from dataclasses import replace
+
+import pytest
+from designs import synthetic_cable
+from matplotlib.colors import to_hex
+from matplotlib.patches import Polygon as MplPolygon, Wedge as MplWedge
+from shapely.geometry import Polygon
+
+from engine import build_cable_geometry
+from engine.render_mpl import _shape_patch
+from engine.styles import element_shapes
+
+TAPE = 'Strip / Flat'
+COLORS = {'bn': ('#9e360a', '#9e360a'), 'bk': ('#1a1a1a', '#1a1a1a'), 'gr': ('#808080', '#808080'),
+          'bu': ('#0000ff', '#0000ff'), 'gnye': ('#008000', '#ffff00')}
+DESIGNS = {
+    '1c circular Round Wire': synthetic_cable(1),
+    '1c circular Strip / Flat': synthetic_cable(1, armour=TAPE),
+    '2c circular Strip / Flat': synthetic_cable(2, armour=TAPE),
+    '3c circular Round Wire': synthetic_cable(3),
+    '3c circular Strip / Flat': synthetic_cable(3, armour=TAPE),
+    '4c circular Strip / Flat': synthetic_cable(4, armour=TAPE),
+    '5c circular Strip / Flat': synthetic_cable(5, armour=TAPE),
+    '7c circular Strip / Flat': synthetic_cable(7, armour=TAPE),
+    '19c circular Strip / Flat': synthetic_cable(19, armour=TAPE),
+    '2c sector': synthetic_cable(2, 'sector', TAPE),
+    '3c sector': synthetic_cable(3, 'sector', TAPE),
+    '4c sector': synthetic_cable(4, 'sector', TAPE),
+    '3c circular bom': replace(synthetic_cable(3, armour=TAPE), core_colors=(
+        COLORS['bn'], COLORS['bk'], COLORS['gr'])),
+    '3c sector bom': replace(synthetic_cable(3, 'sector', TAPE), core_colors=(
+        COLORS['bn'], COLORS['bk'], COLORS['gr'])),
+    '5c circular bom': replace(synthetic_cable(5, armour=TAPE), core_colors=(
+        COLORS['bu'], COLORS['bn'], COLORS['bk'], COLORS['gr'], COLORS['gnye'])),
+}
+SECTOR_AREA_TOLERANCE = 0.005  # relative, the old 100 point arc cuts less than 0.2% of a sector
+SECTOR_BOUNDS_TOLERANCE = 0.02
+
+
+@pytest.fixture(scope='module')
+def legacy_layouts():
+    with open(os.path.join(os.path.dirname(__file__), 'data', 'legacy_layouts.json')) as layouts_file:
+        return json.load(layouts_file)
+
+
+def patch_record(patch):
+    record = {
+        'kind': type(patch).__name__,
+        'facecolor': to_hex(patch.get_facecolor(), keep_alpha=True),
+        'edgecolor': to_hex(patch.get_edgecolor(), keep_alpha=True),
+        'fill': bool(patch.get_fill()),
+        'linewidth': round(float(patch.get_linewidth()), 6),
+    }
+    if patch.get_hatch():
+        record['hatch'] = patch.get_hatch()
+    if patch.get_linestyle() != 'solid':
+        offset, dashes = patch._unscaled_dash_pattern
+        record['linestyle'] = [offset, list(dashes)]
+    if isinstance(patch, MplPolygon):
+        polygon = Polygon(patch.get_xy())
+        record.update(area=polygon.area, bounds=list(polygon.bounds))
+    elif isinstance(patch, MplWedge):
+        record.update(center=list(patch.center), radius=patch.r, theta1=patch.theta1, theta2=patch.theta2)
+    else:
+        record.update(center=list(patch.center), radius=patch.radius)
+    return record
+
+
+def assert_close(actual, expected, where):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), where
+        for key in expected:
+            assert_close(actual[key], expected[key], f'{where}.{key}')
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), where
+        for index, (item, expected_item) in enumerate(zip(actual, expected)):
+            assert_close(item, expected_item, f'{where}[{index}]')
+    elif isinstance(expected, float):
+        assert actual == pytest.approx(expected, abs=1e-6), where
+    else:
+        assert actual == expected, where
+
+
+def painted_records(geometry):
+    # one patch per shape in paint order, before shapes are batched into collections
+    shapes = [shape for element in reversed(geometry.elements) for shape in element_shapes(element)[::-1]]
+    return [patch_record(_shape_patch(shape)) for shape in shapes]
+
+
+@pytest.mark.parametrize('name', DESIGNS)
+def test_shapes_match_legacy_drawing(name, legacy_layouts):
+    expected = legacy_layouts[name]['patches']
+    painted = painted_records(build_cable_geometry(DESIGNS[name]))
+    assert len(painted) == len(expected)
+    for index, (record, legacy) in enumerate(zip(painted, expected)):
+        legacy = dict(legacy)
+        if legacy['kind'] == 'Polygon':
+            assert record.pop('area') == pytest.approx(legacy.pop('area'), rel=SECTOR_AREA_TOLERANCE), index
+            assert record.pop('bounds') == pytest.approx(legacy.pop('bounds'), abs=SECTOR_BOUNDS_TOLERANCE), index
+        assert_close(record, legacy, f'patch {index}')
+
+
+@pytest.mark.parametrize('name', DESIGNS)
+def test_labels_match_legacy_drawing(name, legacy_layouts):
+    labels = [{'text': label.text, 'xy': list(label.xy), 'xytext': list(label.xytext),
+               'connectionstyle': label.connectionstyle} for label in build_cable_geometry(DESIGNS[name]).labels]
+    assert_close(labels, legacy_layouts[name]['labels'], 'labels')
+
+
+def test_layout_is_memoized_per_spec():
+    spec = synthetic_cable(7)
+    assert build_cable_geometry(spec) is build_cable_geometry(synthetic_cable(7))
+    assert build_cable_geometry(spec) is not build_cable_geometry(synthetic_cable(7, armour=TAPE))
+
+
+def test_empty_spec_is_refused():
+    with pytest.raises(ValueError):
+        build_cable_geometry(replace(synthetic_cable(), layers=()))
@@ -0,0 +1,140 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from engine.gltf import INSTANCING_EXTENSION, QUANTIZATION_EXTENSION, export_glb, quantize_positions, vertex_normals
+from engine.mesh_3d import MeshPart, cylinder_batch
+
+NODE_ROUNDING = 1e-4  # node translations are written to 4 decimals
+
+
+def random_vertices(seed, count, extent):
+    return np.random.default_rng(seed).uniform(-0.5, 0.5, (count, 3)) * extent
+
+
+@pytest.mark.parametrize('extent', [(10, 10, 50), (0.5, 0.5, 2), (120, 80, 0)])
+def test_dequantized_positions_within_one_step(extent):
+    vertices = random_vertices(1, 3000, extent)
+    faces = np.arange(len(vertices)).reshape(-1, 3)
+    grid, grid_faces, origin, scale = quantize_positions(vertices, faces)
+    assert grid.dtype == np.uint16
+    restored = origin + grid[grid_faces.reshape(-1)] * scale
+    assert np.all(np.abs(restored - vertices) <= scale)
+
+
+def test_quantized_vertices_on_one_grid_point_are_merged():
+    vertices = random_vertices(2, 300, (10, 10, 10))
+    vertices = np.vstack([vertices, vertices + 1e-9])  # each one twice, far less than a step apart
+    faces = np.arange(len(vertices)).reshape(-1, 3)
+    grid, grid_faces, __, __ = quantize_positions(vertices, faces)
+    assert len(grid) == 300
+    assert grid_faces.max() < len(grid)
+
+
+def read_glb(content):
+    magic, __, length = struct.unpack_from('<III', content)
+    assert (magic, length) == (0x46546C67, len(content))
+    json_length, __ = struct.unpack_from('<II', content, 12)
+    gltf = json.loads(content[20:20 + json_length])
+    binary = content[20 + json_length + 8:]
+    return gltf, binary
+
+
+def read_accessor(gltf, binary, index):
+    accessor = gltf['accessors'][index]
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = {5122: np.int16, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[accessor['componentType']]
+    width = {'SCALAR': 1, 'VEC3': 3}[accessor['type']]
+    stride = view.get('byteStride', dtype().itemsize * width) // dtype().itemsize
+    data = np.frombuffer(binary, dtype, view['byteLength'] // dtype().itemsize, view['byteOffset'])
+    data = data.reshape(-1, stride)[:accessor['count'], :width].astype(float)
+    if accessor.get('normalized'):
+        data = np.maximum(data / np.iinfo(dtype).max, -1.0)
+    return data
+
+
+def world_positions(gltf, binary):
+    # scene space (position, unit normal) of each face corner of every copy of every mesh, by mesh name
+    meshes = {}
+
+    def visit(index, offset, scale):
+        node = gltf['nodes'][index]
+        node_scale = np.asarray(node.get('scale', (1, 1, 1)), dtype=float)
+        offset, scale = offset + scale * np.asarray(node.get('translation', (0, 0, 0)), dtype=float), scale * node_scale
+        if 'mesh' in node:
+            mesh = gltf['meshes'][node['mesh']]
+            primitive = mesh['primitives'][0]
+            corners = read_accessor(gltf, binary, primitive['indices']).astype(int).reshape(-1)
+            positions = read_accessor(gltf, binary, primitive['attributes']['POSITION'])[corners]
+            normals = read_accessor(gltf, binary, primitive['attributes']['NORMAL'])[corners] / scale
+            normals /= np.linalg.norm(normals, axis=1, keepdims=True)  # normals scale by the inverse transpose
+            instancing = node.get('extensions', {}).get(INSTANCING_EXTENSION)
+            copies = (read_accessor(gltf, binary, instancing['attributes']['TRANSLATION']) if instancing
+                      else np.zeros((1, 3)))
+            meshes.setdefault(mesh['name'], []).extend((offset + scale * (copy + positions), normals)
+                                                       for copy in copies)
+        for child in node.get('children', ()):
+            visit(child, offset, scale)
+
+    for root in gltf['scenes'][0]['nodes']:
+        visit(root, np.zeros(3), np.ones(3))
+    return meshes
+
+
+def random_parts():
+    faces = np.arange(600).reshape(-1, 3)  # every vertex in one face, its normal is the face normal
+    return [
+        MeshPart('wire', random_vertices(3, 600, (2, 2, 50)), faces, (128, 128, 128, 255),
+                 np.array([[10.0, 0.0, 0.0], [-5.0, 8.66, 0.0], [-5.0, -8.66, 0.0]]), layer=1),
+        MeshPart('sheath', random_vertices(4, 600, (30, 30, 50)), faces, (26, 26, 26, 255),
+                 np.zeros((1, 3)), layer=2),
+    ]
+
+
+def face_normals(part):
+    corners = part.vertices[part.faces]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    return np.repeat(normals / np.linalg.norm(normals, axis=1, keepdims=True), 3, axis=0)
+
+
+@pytest.mark.parametrize('instancing', ('gpu', 'nodes'))
+def test_quantized_glb_positions_within_one_step(instancing):
+    parts = random_parts()
+    gltf, binary = read_glb(export_glb(parts, instancing=instancing, quantize=True))
+    assert QUANTIZATION_EXTENSION in gltf['extensionsRequired']
+    meshes = world_positions(gltf, binary)
+    for part in parts:
+        step = quantize_positions(part.vertices, part.faces)[3]
+        copies = meshes[part.name]
+        assert len(copies) == len(part.translations)
+        corners = part.vertices[part.faces.reshape(-1)]  # merged vertices leave the face corners in place
+        for translation, (positions, __) in zip(part.translations, copies):
+            assert np.all(np.abs(positions - (corners + translation)) <= step + NODE_ROUNDING)
+
+
+@pytest.mark.parametrize('instancing', ('gpu', 'nodes'))
+@pytest.mark.parametrize('quantize', (False, True))
+def test_glb_normals_point_like_the_faces(instancing, quantize):
+    parts = random_parts()
+    gltf, binary = read_glb(export_glb(parts, instancing=instancing, quantize=quantize))
+    normal_types = {gltf['accessors'][mesh['primitives'][0]['attributes']['NORMAL']]['componentType']
+                    for mesh in gltf['meshes']}
+    assert normal_types == ({5122} if quantize else {5126})  # normalized shorts under KHR_mesh_quantization
+    meshes = world_positions(gltf, binary)
+    for part in parts:
+        expected = face_normals(part)
+        for __, normals in meshes[part.name]:
+            assert np.einsum('ij,ij->i', normals, expected).min() >= 0.9999
+
+
+def test_vertex_normals_are_smooth_around_a_cylinder():
+    vertices, faces, __ = cylinder_batch([(0.0, 0.0)], 5.0, 20.0, 32)
+    normals = vertex_normals(vertices, faces)
+    assert np.allclose(np.linalg.norm(normals, axis=1), 1)
+    rim = np.hypot(vertices[:, 0], vertices[:, 1]) > 1  # ring vertices, shared by the side and a cap
+    radial = vertices[rim, :2] / np.linalg.norm(vertices[rim, :2], axis=1, keepdims=True)
+    horizontal = normals[rim, :2] / np.linalg.norm(normals[rim, :2], axis=1, keepdims=True)
+    assert np.einsum('ij,ij->i', radial, horizontal).min() >= 0.9999  # not the normal of either side face
+    assert np.all(np.sign(normals[rim, 2]) == np.sign(vertices[rim, 2]))  # leaning toward their cap
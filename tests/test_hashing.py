@@ -0,0 +1,46 @@
+from dataclasses import replace
+
+import pytest
+from designs import synthetic_cable
+
+from engine import spec_digest
+from engine.render import render_key
+
+
+def test_digest_is_a_stable_sha256():
+    digest = spec_digest(synthetic_cable(3))
+    assert len(digest) == 64 and set(digest) <= set('0123456789abcdef')
+    assert digest == spec_digest(synthetic_cable(3))
+
+
+def test_digest_ignores_float_noise_and_negative_zero():
+    spec = synthetic_cable(3)
+    conductor = spec.layers[0]
+    noisy = replace(spec, layers=(replace(conductor, diameter=conductor.diameter + 1e-9, rotation=-0.0),)
+                    + spec.layers[1:])
+    assert spec_digest(noisy) == spec_digest(spec)
+
+
+@pytest.mark.parametrize('change', (
+    dict(no_cores=4),
+    dict(shape='sector'),
+    dict(conductor_material='Aluminium'),
+    dict(layup_multiplier=2.5),
+    dict(core_colors=(('#9e360a', '#9e360a'),) * 3),
+))
+def test_digest_changes_with_the_design(change):
+    spec = synthetic_cable(3)
+    assert spec_digest(replace(spec, **change)) != spec_digest(spec)
+
+
+def test_digest_changes_with_a_layer_setting():
+    spec = synthetic_cable(3)
+    sheath = replace(spec.layers[-1], color_fill='#ff0000')
+    assert spec_digest(replace(spec, layers=spec.layers[:-1] + (sheath,))) != spec_digest(spec)
+
+
+def test_render_key_changes_with_format_and_version():
+    spec = synthetic_cable(3)
+    assert render_key(spec, 'png') != render_key(spec, 'svg')
+    assert spec_digest(spec, 'png', 1) != spec_digest(spec, 'png', 2)
+    assert spec_digest(spec, 'png', 1) != spec_digest(spec)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from engine.layup import solve_layup
+
+TOLERANCE = 1e-3  # the multiplication factor is rounded to 3 decimals
+
+
+def core_centers(layup, twist):
+    # every ring evenly spaced, each one turned by its own angle since the layout is free to rotate them
+    centers = []
+    for ring, (cores, radius) in enumerate(zip(layup.rings, layup.ring_radii)):
+        angles = twist * ring + 2 * np.pi * np.arange(cores) / cores
+        centers.append(np.column_stack([radius * np.cos(angles), radius * np.sin(angles)]))
+    return np.vstack(centers)
+
+
+@pytest.mark.parametrize('pitch_ratio', (1.0, 1.2))
+@pytest.mark.parametrize('no_cores', range(1, 100))
+def test_layup_has_no_overlaps(no_cores, pitch_ratio):
+    layup = solve_layup(no_cores, pitch_ratio)
+    assert layup.no_cores == no_cores
+    assert all(cores > 0 for cores in layup.rings)
+    for twist in (0.0, 0.37, np.pi / 5):
+        centers = core_centers(layup, twist)
+        distances = np.hypot(*(centers[:, None] - centers[None, :]).transpose(2, 0, 1))
+        np.fill_diagonal(distances, np.inf)
+        assert distances.min() >= 1 - TOLERANCE  # in core diameters: touching at most
+        assert np.hypot(*centers.T).max() + 0.5 <= layup.multiplier / 2 + TOLERANCE  # inside the lay-up circle
+
+
+@pytest.mark.parametrize('no_cores, rings, multiplier', [
+    (1, (1,), 1.0),
+    (3, (3,), 2.155),
+    (7, (1, 6), 3.0),
+    (19, (1, 6, 12), 5.0),
+    (61, (1, 6, 12, 18, 24), 9.0),
+])
+def test_layup_matches_tables(no_cores, rings, multiplier):
+    layup = solve_layup(no_cores)
+    assert layup.rings == rings
+    assert layup.multiplier == pytest.approx(multiplier, abs=TOLERANCE)
+
+
+def test_layup_rejects_no_cores():
+    with pytest.raises(ValueError):
+        solve_layup(0)
+
+
+@pytest.mark.parametrize('pitch_ratio', (1.0, 1.2, 1.5))
+@pytest.mark.parametrize('no_cores', (5, 12, 19, 30, 61))
+def test_layup_keeps_the_pitch_within_rings(no_cores, pitch_ratio):
+    layup = solve_layup(no_cores, pitch_ratio)
+    for cores, radius in zip(layup.rings, layup.ring_radii):
+        if cores > 1:
+            assert 2 * radius * np.sin(np.pi / cores) >= pitch_ratio - TOLERANCE
+    assert solve_layup(no_cores, pitch_ratio) is layup  # memoized per core count and pitch ratio
+
+
+def test_wider_pitch_never_shrinks_the_layup():
+    for no_cores in range(2, 62):
+        assert solve_layup(no_cores, 1.3).multiplier >= solve_layup(no_cores).multiplier
@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+import trimesh
+from designs import synthetic_cable
+
+from engine import build_cable_geometry, solve_layup
+from engine.mesh_3d import (
+    LOD_CHORD_ERRORS, MAX_SECTIONS, MIN_SECTIONS, arc_sections, build_cable_mesh, build_cable_parts, strand_bundle,
+    strand_centers, tube_batch,
+)
+
+LENGTH, STEP = 50.0, 5.0
+STRANDS = solve_layup(7)
+
+
+def chord_gap(radius, sections):
+    return radius * (1 - np.cos(np.pi / sections))
+
+
+def polygon_area(radius, sections):
+    return sections / 2 * radius ** 2 * np.sin(2 * np.pi / sections)
+
+
+@pytest.mark.parametrize('sections', (6, 17, 64))
+def test_tube_is_a_closed_hollow_solid(sections):
+    vertices, faces, owners = tube_batch(3.0, 5.0, 10.0, sections)
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    assert mesh.is_watertight and mesh.is_winding_consistent
+    assert mesh.volume == pytest.approx((polygon_area(5.0, sections) - polygon_area(3.0, sections)) * 10.0)
+    assert len(faces) == 8 * sections and not owners.any()
+
+
+def test_tube_walls_sit_on_their_radii():
+    vertices, __, __ = tube_batch(3.0, 5.0, 10.0, 32)
+    radii = np.round(np.hypot(vertices[:, 0], vertices[:, 1]), 9)
+    assert set(radii) == {3.0, 5.0}
+    assert set(vertices[:, 2]) == {-5.0, 5.0}
+
+
+def test_tube_batch_mixes_sizes_and_sections():
+    vertices, faces, owners = tube_batch([1.0, 4.0], [2.0, 6.0], [8.0, 4.0], [12, 40])
+    assert np.bincount(owners).tolist() == [8 * 12, 8 * 40]
+    for tube, (inner, outer, height) in enumerate(((1.0, 2.0, 8.0), (4.0, 6.0, 4.0))):
+        corners = vertices[np.unique(faces[owners == tube])]
+        radii = np.hypot(corners[:, 0], corners[:, 1])
+        assert radii.min() == pytest.approx(inner) and radii.max() == pytest.approx(outer)
+        assert np.abs(corners[:, 2]).max() == pytest.approx(height / 2)
+
+
+@pytest.mark.parametrize('armour', ('Round Wire', 'Strip / Flat'))
+def test_concentric_layers_are_hollow_down_to_the_layer_below(armour):
+    geometry = build_cable_geometry(synthetic_cable(3, armour=armour))
+    parts = {part.name: part for part in build_cable_parts(geometry, LENGTH, STEP)}
+    covered = 0.0
+    for element in geometry.elements:
+        if element.role not in ('filler', 'tape', 'sheath', 'armour_tape'):
+            continue
+        radii = np.hypot(*parts[f'{element.role}_{element.layer}'].vertices[:, :2].T)
+        inner = element.inner_radius if element.role == 'armour_tape' else covered
+        assert radii.min() == pytest.approx(inner, abs=1e-9)
+        assert radii.max() == pytest.approx(element.outer_radius)
+        covered = element.outer_radius
+
+
+@pytest.mark.parametrize('radius', (0.05, 0.4, 1.0, 4.0, 12.0, 60.0))
+@pytest.mark.parametrize('chord_error', (0.001, 0.01, 0.1))
+def test_arc_sections_are_the_fewest_within_the_chord_error(radius, chord_error):
+    sections = arc_sections(radius, chord_error)
+    assert MIN_SECTIONS <= sections <= MAX_SECTIONS
+    if sections < MAX_SECTIONS:
+        assert chord_gap(radius, sections) <= chord_error * (1 + 1e-9)
+    if sections > MIN_SECTIONS:
+        assert chord_gap(radius, sections - 1) > chord_error
+
+
+@pytest.mark.parametrize('cores, shape', ((1, 'circular'), (3, 'sector'), (19, 'circular')))
+def test_preview_is_lighter_than_full(cores, shape):
+    geometry = build_cable_geometry(synthetic_cable(cores, shape))
+    preview = build_cable_mesh(geometry, LENGTH, STEP, lod='preview')
+    full = build_cable_mesh(geometry, LENGTH, STEP, lod='full')
+    assert len(preview.faces) < len(full.faces)
+    assert preview.bounds == pytest.approx(full.bounds, abs=LOD_CHORD_ERRORS['preview'] * geometry.extent)
+
+
+@pytest.mark.parametrize('lod', LOD_CHORD_ERRORS)
+def test_cylinders_follow_the_chord_error_of_their_lod(lod):
+    geometry = build_cable_geometry(synthetic_cable(19))
+    chord_error = LOD_CHORD_ERRORS[lod] * geometry.extent
+    for part in build_cable_parts(geometry, LENGTH, STEP, lod=lod):
+        if part.name.startswith(('conductor', 'insulation', 'armour_wire', 'filler')):
+            sections = (len(part.vertices) - 2) // 2  # two rings and the two cap centers
+            radius = np.hypot(*part.vertices[:, :2].T).max()
+            assert sections == arc_sections(radius, chord_error)
+
+
+def test_strands_fill_their_conductor_without_overlapping():
+    centers, strand_radius = strand_centers((2.0, -1.0), 3.0, STRANDS)
+    centers = np.array(centers)
+    assert len(centers) == STRANDS.no_cores
+    reach = np.hypot(*(centers - (2.0, -1.0)).T) + strand_radius
+    assert reach.max() == pytest.approx(3.0)
+    gaps = np.hypot(*(centers[:, None] - centers[None]).T)[~np.eye(len(centers), dtype=bool)]
+    assert gaps.min() >= 2 * strand_radius - 1e-9
+
+
+def test_strand_bundle_is_shared_and_read_only():
+    bundle = strand_bundle(3.0, STRANDS, 40.0, 12)
+    assert strand_bundle(3.0, STRANDS, 40.0, 12) is bundle
+    vertices, faces = bundle
+    assert not vertices.flags.writeable and not faces.flags.writeable
+    assert len(faces) == STRANDS.no_cores * 4 * 12
+
+
+@pytest.mark.parametrize('cores', (3, 19))
+def test_stranded_cores_are_copies_of_one_bundle(cores):
+    geometry = build_cable_geometry(synthetic_cable(cores))
+    conductors = geometry.by_role('conductor')
+    mesh = build_cable_mesh(geometry, LENGTH, STEP, STRANDS)
+    parts = build_cable_parts(geometry, LENGTH, STEP, STRANDS)
+    strands = [part for part in parts if part.name.startswith('strands')]
+    assert len(strands) == 1 and len(strands[0].translations) == cores * STRANDS.no_cores
+    assert sum(part.triangle_count for part in parts) == len(mesh.faces)
+    # every core is the bundle moved onto the conductor center
+    radius, height = conductors[0].radius, LENGTH - STEP
+    sections = (len(strands[0].vertices) - 2) // 2
+    vertices, __ = strand_bundle(round(radius, 6), STRANDS, round(height, 6), sections)
+    expected = np.concatenate([vertices + (*conductor.center, 0.0) for conductor in conductors])
+    stranded = mesh.vertices[:len(expected)]
+    assert stranded == pytest.approx(expected)
@@ -0,0 +1,39 @@
+import re
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+from designs import synthetic_cable
+
+from engine import build_cable_geometry
+from engine.render_svg import _SvgWriter, svg_document
+from engine.styles import Shape
+
+
+def pattern_ids(defs):
+    return set(re.findall(r'<pattern id="([^"]+)"', ''.join(defs)))
+
+
+@pytest.mark.parametrize('hatch', ('.', '-', '+', '|', 'o', '*'))
+def test_unsupported_hatch_is_a_plain_fill(hatch):
+    writer = _SvgWriter(1.0)
+    markup = writer.shape(Shape('circle', (0, 0), 2.0, facecolor='#ff0000', hatch=hatch))
+    assert 'url(#' not in markup
+    assert markup.count('<circle') == 1 and 'fill="#ff0000"' in markup
+    assert not writer.defs
+
+
+def test_supported_hatches_share_one_pattern_per_hatch_and_color():
+    writer = _SvgWriter(1.0)
+    markups = [writer.shape(Shape('circle', (0, 0), 2.0, facecolor='#ff0000', hatch=hatch, edgecolor=edge))
+               for hatch, edge in (('xx', 'black'), ('.', 'black'), ('xx', 'black'), ('O', 'black'), ('xx', 'red'))]
+    used = [re.findall(r'url\(#([^)]+)\)', markup) for markup in markups]
+    assert used[0] == used[2] and not used[1]
+    assert len({ids[0] for ids in used if ids}) == 3
+    assert {ids[0] for ids in used if ids} == pattern_ids(writer.defs)
+
+
+@pytest.mark.parametrize('cores, shape, armour', [(3, 'sector', 'Round Wire'), (19, 'circular', 'Strip / Flat')])
+def test_every_fill_reference_has_its_pattern(cores, shape, armour):
+    document = svg_document(build_cable_geometry(synthetic_cable(cores, shape, armour)))
+    ElementTree.fromstring(document)  # well-formed
+    assert set(re.findall(r'url\(#([^)]+)\)', document)) <= pattern_ids([document])
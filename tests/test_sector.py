@@ -0,0 +1,34 @@
+import pytest
+from shapely.geometry import Polygon
+
+from engine.sector import CHORD_TOLERANCE, _analytic_sector_points, _buffered_sector_points, rounded_sector_points
+
+SPANS = (30, 60, 90, 120, 180)
+RADII = (2, 5, 12, 30)
+ROUNDINGS = ((0, 0), (1, 0), (1.5, 0.5), (2, 1), (3, 2), (4, 1))  # (erosion, fillet)
+
+
+@pytest.mark.parametrize('span', SPANS)
+@pytest.mark.parametrize('radius', RADII)
+@pytest.mark.parametrize('erosion, fillet', ROUNDINGS)
+def test_analytic_sector_matches_buffered(span, radius, erosion, fillet):
+    # both are tessellations of the same shape, each within one chord tolerance of the true outline
+    analytic = _analytic_sector_points((3, -2), radius, 90, 90 + span, erosion, fillet, CHORD_TOLERANCE)
+    buffered = _buffered_sector_points((3, -2), radius, 90, 90 + span, erosion, fillet)
+    assert (analytic is None) == (buffered is None)
+    if analytic is None:
+        return
+    analytic, buffered = Polygon(analytic), Polygon(buffered)
+    assert analytic.is_valid
+    assert analytic.hausdorff_distance(buffered) <= 2 * CHORD_TOLERANCE
+    assert analytic.symmetric_difference(buffered).area <= 2 * CHORD_TOLERANCE * buffered.length
+
+
+def test_sector_outline_is_closed_and_read_only():
+    points = rounded_sector_points((0, 0), 10, 90, 210, 1, 0.5)
+    assert tuple(points[0]) == tuple(points[-1])
+    assert not points.flags.writeable
+
+
+def test_sector_eaten_by_rounding():
+    assert rounded_sector_points((0, 0), 2, 90, 120, 2, 1) is None
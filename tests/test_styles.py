@@ -0,0 +1,94 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+from designs import synthetic_cable
+from matplotlib.collections import PatchCollection
+from shapely.geometry import Point, Polygon
+
+from engine import build_cable_geometry, render_mpl
+from engine.render_mpl import _shape_patch, geometry_artists, new_figure
+from engine.styles import element_shapes, geometry_shape_batches, geometry_shapes
+
+DESIGNS = ((3, 'circular'), (3, 'sector'), (5, 'circular'), (19, 'circular'), (61, 'circular'))
+
+
+def shape_key(shape):
+    points = () if shape.points is None else tuple(np.ravel(shape.points))
+    return (shape.kind, tuple(shape.center), shape.radius, shape.theta1, shape.theta2, points, shape.facecolor,
+            shape.edgecolor, shape.fill, shape.hatch, shape.linewidth, shape.dashes, shape.joinstyle)
+
+
+def unbatched_shapes(geometry):
+    return [shape for element in reversed(geometry.elements) for shape in element_shapes(element)[::-1]]
+
+
+def outline(shape):
+    if shape.kind == 'polygon':
+        return Polygon(shape.points)
+    return Point(shape.center).buffer(shape.radius)  # half wedges are checked as their whole circle
+
+
+def pixels(geometry, artists):
+    fig, ax = new_figure()
+    for artist in artists:
+        if isinstance(artist, PatchCollection):
+            ax.add_collection(artist, autolim=False)
+        else:
+            ax.add_patch(artist)
+    ax.set_xlim(-geometry.extent, geometry.extent * 3)
+    ax.set_ylim(-geometry.extent - 1, geometry.extent + 1)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).astype(int)
+
+
+@pytest.mark.parametrize('cores, shape', DESIGNS)
+def test_batches_hold_every_shape_once(cores, shape):
+    geometry = build_cable_geometry(synthetic_cable(cores, shape))
+    batched = sorted(map(shape_key, geometry_shapes(geometry)), key=repr)
+    assert batched == sorted(map(shape_key, unbatched_shapes(geometry)), key=repr)
+
+
+@pytest.mark.parametrize('cores, shape', DESIGNS)
+def test_batched_shapes_do_not_overlap(cores, shape):
+    # painting a batch in one go only keeps the stacking if its shapes never cover each other
+    geometry = build_cable_geometry(synthetic_cable(cores, shape))
+    for batch in geometry_shape_batches(geometry):
+        for first, second in combinations(batch, 2):
+            assert outline(first).intersection(outline(second)).area < 1e-3
+
+
+def test_armour_wires_are_three_batches():
+    geometry = build_cable_geometry(synthetic_cable(19))
+    wires = len(geometry.by_role('armour_wire'))
+    batches = [batch for batch in geometry_shape_batches(geometry) if len(batch) == wires]
+    assert len(batches) == 3
+    shadow, core, ring = batches
+    radius = shadow[0].radius
+    assert all(shape.fill and shape.radius == radius for shape in shadow)
+    assert all(shape.radius == radius * 0.5 for shape in core)
+    assert all(not shape.fill and shape.radius == radius for shape in ring)
+
+
+def test_artist_count_does_not_grow_with_the_cores():
+    counts = {cores: len(geometry_artists(build_cable_geometry(synthetic_cable(cores))))
+              for cores in (7, 19, 37, 61)}
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_hatched_batches_fall_back_to_patches_without_hatch_colors(monkeypatch):
+    geometry = build_cable_geometry(synthetic_cable(19))
+    monkeypatch.setattr(render_mpl, 'HATCH_COLORS', False)
+    artists = geometry_artists(geometry)
+    assert not any(isinstance(artist, PatchCollection) and artist.get_hatch() for artist in artists)
+    assert len(artists) > len(geometry_shape_batches(geometry))
+
+
+@pytest.mark.parametrize('cores, shape', DESIGNS)
+def test_batched_drawing_looks_like_one_patch_per_shape(cores, shape):
+    geometry = build_cable_geometry(synthetic_cable(cores, shape))
+    batched = pixels(geometry, geometry_artists(geometry))
+    patched = pixels(geometry, [_shape_patch(shape) for shape in unbatched_shapes(geometry)])
+    difference = np.abs(batched - patched).max(axis=2)
+    assert difference.max() <= 48  # anti-aliasing of collections, never a differently colored shape
+    assert (difference > 0).mean() < 0.02